@@ -4,10 +4,64 @@ Hook Router — Routes lifecycle events to the appropriate handler.
 
 Usage: python hooks.py <hook_type>
 Hook types: session_start, pre_tool_use, post_tool_use, user_prompt_submit, stop
+
+Set CLAUDE_HOOKS_DAEMON=1 to serve session_start/pre_tool_use from a
+long-lived hooks_daemon.py (POSIX only) instead of importing the handlers
+on every call.
 """
 
 import json
+import os
 import sys
+from pathlib import Path
+
+# Hook types with a real handler in interactive.py — the rest are no-ops and
+# answer here without importing the handler module
+HANDLED_HOOKS = {"session_start", "pre_tool_use", "post_tool_use"}
+
+USE_DAEMON = os.environ.get("CLAUDE_HOOKS_DAEMON") == "1"
+
+# Cheap enough for the single-threaded daemon. post_tool_use shells out to
+# tsc for seconds at a time, so it always runs in-process.
+DAEMON_HOOKS = {"session_start", "pre_tool_use"}
+
+# AF_UNIX paths are capped at ~108 bytes; deeper projects skip the daemon
+MAX_SOCKET_PATH = 100
+
+
+def _spawn_daemon(sock_path: Path) -> None:
+    import subprocess
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("hooks_daemon.py")), str(sock_path)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _via_daemon(hook_type: str, payload: bytes) -> bytes:
+    """Run the hook in the daemon. Returns b"" when it has to run in-process."""
+    import socket
+
+    sock_path = Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())) / ".claude" / "hooks.sock"
+    if not hasattr(socket, "AF_UNIX") or len(str(sock_path)) > MAX_SOCKET_PATH:
+        return b""
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(5)
+            client.connect(str(sock_path))
+            client.sendall(hook_type.encode() + b"\n" + payload)
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := client.recv(65536):
+                chunks.append(chunk)
+            return b"".join(chunks)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon yet (or a stale socket) — start one for the next call
+        _spawn_daemon(sock_path)
+        return b""
+    except OSError:
+        return b""
 
 
 def main():
@@ -16,9 +70,20 @@ def main():
         sys.exit(1)
 
     hook_type = sys.argv[1].lower()
+    payload = sys.stdin.buffer.read()
+
+    if hook_type not in HANDLED_HOOKS:
+        print("{}")
+        sys.exit(0)
+
+    if USE_DAEMON and hook_type in DAEMON_HOOKS:
+        reply = _via_daemon(hook_type, payload)
+        if reply:
+            sys.stdout.buffer.write(reply)
+            sys.exit(0)
 
     try:
-        data = json.load(sys.stdin)
+        data = json.loads(payload)
     except json.JSONDecodeError:
         data = {}
 
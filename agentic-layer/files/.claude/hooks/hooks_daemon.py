@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon — Keeps interactive.py warm between hook invocations.
+
+Started on demand by hooks.py when CLAUDE_HOOKS_DAEMON=1 (POSIX only).
+Serves one hook per connection on a UNIX socket and exits after
+IDLE_TIMEOUT seconds without traffic, or once the hook sources change.
+
+Protocol: the client sends "<hook_type>\\n<raw JSON payload>" and closes
+its write side. The daemon replies with exactly what the hook would have
+written to stdout. An empty reply means "run the hook yourself".
+
+Usage: python hooks_daemon.py <socket_path>
+"""
+
+import contextlib
+import fcntl
+import io
+import json
+import socket
+import sys
+from pathlib import Path
+
+import interactive
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+HOOKS_DIR = Path(__file__).resolve().parent
+
+# Seconds without a connection before the daemon exits
+IDLE_TIMEOUT = 600
+
+# Seconds to wait for a client to finish sending its request
+REQUEST_TIMEOUT = 5
+
+# Restart (on next hook) when any of these change on disk
+WATCHED_FILES = [HOOKS_DIR / "interactive.py", HOOKS_DIR / "validate.py"]
+
+
+# =============================================================================
+# Request Handling
+# =============================================================================
+
+def _sources_mtime() -> int:
+    return max((p.stat().st_mtime_ns for p in WATCHED_FILES if p.exists()), default=0)
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while chunk := conn.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def handle(request: bytes) -> bytes:
+    """Run one hook in-process and return what it wrote to stdout."""
+    hook_type, _, payload = request.partition(b"\n")
+
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError:
+        data = {}
+
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    with contextlib.redirect_stdout(stdout):
+        try:
+            interactive.main(hook_type.decode(), data)
+        except SystemExit:
+            pass  # output() always exits — that's the end of the response
+        stdout.flush()
+    return stdout.buffer.getvalue()
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+def serve(sock_path: Path) -> None:
+    # One daemon per socket: the lock is held until this process exits
+    lock = open(f"{sock_path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return
+
+    # Whatever is at the path belongs to a daemon that is no longer running
+    with contextlib.suppress(FileNotFoundError):
+        sock_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(sock_path))
+    server.listen()
+    server.settimeout(IDLE_TIMEOUT)
+    started_mtime = _sources_mtime()
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            with conn:
+                conn.settimeout(REQUEST_TIMEOUT)
+                try:
+                    reply = handle(_recv_all(conn))
+                except Exception:
+                    reply = b""  # Client falls back to running the hook itself
+                with contextlib.suppress(OSError):
+                    conn.sendall(reply)
+
+            if _sources_mtime() != started_mtime:
+                break
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            sock_path.unlink()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python hooks_daemon.py <socket_path>", file=sys.stderr)
+        sys.exit(1)
+    serve(Path(sys.argv[1]))
@@ -11,8 +11,16 @@ Features:
 
 import json
 import os
-import subprocess
+import re
 import sys
+from pathlib import Path
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:  # orjson is optional — stdlib json is the fallback
+    def _dumps(data: object) -> bytes:
+        return json.dumps(data).encode()
 
 # =============================================================================
 # Configuration
@@ -27,63 +35,179 @@ DANGEROUS_PATTERNS = [
     "dd if=/dev/zero",
 ]
 
+# Characters that may follow a root command ("" = end of command)
+ROOT_TERMINATORS = frozenset({" ", "\t", "\n", ";", "&", "|", ""})
+
 # Patterns that need boundary checking (not substring match)
 DANGEROUS_ROOT_COMMANDS = [
-    ("rm -rf /", [" ", "\t", "\n", ";", "&", "|", ""]),
-    ("rm -rf /*", [" ", "\t", "\n", ";", "&", "|", ""]),
-    ("chmod -R 777 /", [" ", "\t", "\n", ";", "&", "|", ""]),
+    ("rm -rf /", ROOT_TERMINATORS),
+    ("rm -rf /*", ROOT_TERMINATORS),
+    ("chmod -R 777 /", ROOT_TERMINATORS),
 ]
 
-PROTECTED_PATHS = [".env", ".env.local", ".env.production", "id_rsa", "id_ed25519", ".ssh/"]
+PROTECTED_PATHS = (".env", ".env.local", ".env.production", "id_rsa", "id_ed25519", ".ssh/")
+
+# Download-piped-to-shell: blocked when a source and a sink both appear
+PIPE_SOURCES = ["curl ", "wget "]
+PIPE_SINKS = ["| sh", "| bash"]
+
+# All Bash literals above compile into one alternation so each command is
+# scanned once. Longest literals go first so "rm -rf /*" wins over "rm -rf /".
+_DANGEROUS, _ROOT, _PIPE_SOURCE, _PIPE_SINK = range(4)
+
+_BASH_RULES: dict[str, tuple[int, frozenset[str] | None]] = {
+    **{p: (_DANGEROUS, None) for p in DANGEROUS_PATTERNS},
+    **{p: (_ROOT, terminators) for p, terminators in DANGEROUS_ROOT_COMMANDS},
+    **{p: (_PIPE_SOURCE, None) for p in PIPE_SOURCES},
+    **{p: (_PIPE_SINK, None) for p in PIPE_SINKS},
+}
+_BASH_SCANNER = re.compile("|".join(map(re.escape, sorted(_BASH_RULES, key=len, reverse=True))))
+_PROTECTED_SCANNER = re.compile("|".join(map(re.escape, PROTECTED_PATHS)))
+
+# Git state from the last session start, reused while HEAD is unchanged
+SESSION_CACHE_FILE = ".claude/.session_cache.json"
 
 
 # =============================================================================
 # Output Helpers
 # =============================================================================
 
-def output(data: dict) -> None:
-    print(json.dumps(data))
+# Fixed-shape responses, serialized once — only the reason is encoded per call
+_ALLOW_PREFIX = b'{"hookSpecificOutput":{"hookEventName":"PreToolUse","permissionDecision":"allow","permissionDecisionReason":'
+_DENY_PREFIX = b'{"hookSpecificOutput":{"hookEventName":"PreToolUse","permissionDecision":"deny","permissionDecisionReason":'
+_DECISION_SUFFIX = b"}}\n"
+_EMPTY = b"{}\n"
+
+
+def _write(response: bytes) -> None:
+    sys.stdout.buffer.write(response)
+    sys.stdout.flush()
     sys.exit(0)
 
 
+def output(data: dict) -> None:
+    _write(_dumps(data) + b"\n" if data else _EMPTY)
+
+
 def allow(reason: str = "") -> None:
-    output({
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": "allow",
-            "permissionDecisionReason": reason or "Auto-approved"
-        }
-    })
+    _write(_ALLOW_PREFIX + _dumps(reason or "Auto-approved") + _DECISION_SUFFIX)
 
 
 def deny(reason: str) -> None:
-    output({
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": "deny",
-            "permissionDecisionReason": reason
-        }
-    })
+    _write(_DENY_PREFIX + _dumps(reason) + _DECISION_SUFFIX)
 
 
 # =============================================================================
-# Handlers
+# Git State
 # =============================================================================
 
-def handle_session_start(data: dict) -> None:
-    """Inject git context for orientation."""
-    cwd = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
-
+def _git_dir(cwd: str) -> Path | None:
+    """Locate the git directory, following the `gitdir:` file used by worktrees."""
+    dot_git = Path(cwd) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        pointer = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not pointer.startswith("gitdir: "):
+        return None
+    return dot_git.parent / pointer[len("gitdir: "):]
+
+
+def _read_head(git_dir: Path | None) -> str | None:
+    """Raw contents of HEAD, or None if it can't be read."""
+    if git_dir is None:
+        return None
     try:
+        return (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+
+
+def _branch_from_head(head: str) -> str | None:
+    """Branch name from HEAD contents, "<hash> (detached)", or None if malformed."""
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/"):]
+    if len(head) in (40, 64) and all(c in "0123456789abcdef" for c in head):
+        return f"{head[:7]} (detached)"
+    return None
+
+
+def _git_cache_key(git_dir: Path, head: str) -> str:
+    """Fingerprint HEAD (contents + mtime of the ref it points at)."""
+    ref_mtime = 0
+    if head.startswith("ref: "):
+        # Worktrees keep branch refs in the shared common dir
+        refs_dir = git_dir
+        try:
+            refs_dir = git_dir / (git_dir / "commondir").read_text().strip()
+        except OSError:
+            pass
+
+        # Loose ref first, packed-refs when the branch has been packed
+        for ref_file in (refs_dir / head[5:], refs_dir / "packed-refs"):
+            try:
+                ref_mtime = ref_file.stat().st_mtime_ns
+                break
+            except OSError:
+                continue
+
+    return f"{head}:{ref_mtime}"
+
+
+def _git_state(cwd: str) -> tuple[str, str]:
+    """Return (branch, recent commits), skipping git when the cache is fresh."""
+    cache_path = Path(cwd) / SESSION_CACHE_FILE
+    git_dir = _git_dir(cwd)
+    head = _read_head(git_dir)
+    key = _git_cache_key(git_dir, head) if head else None
+
+    if key:
+        try:
+            cached = json.loads(cache_path.read_text())
+            if cached.get("key") == key:
+                return cached["branch"], cached["commits"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass  # Missing or corrupt cache — fall through to git
+
+    import subprocess
+
+    branch = _branch_from_head(head) if head else None
+    if branch is None:
+        # HEAD missing or malformed — let git resolve it
         branch = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
             capture_output=True, text=True, cwd=cwd, timeout=5
         ).stdout.strip()
 
-        commits = subprocess.run(
-            ["git", "log", "--oneline", "-3"],
-            capture_output=True, text=True, cwd=cwd, timeout=5
-        ).stdout.strip()
+    commits = subprocess.run(
+        ["git", "log", "--oneline", "-3"],
+        capture_output=True, text=True, cwd=cwd, timeout=5
+    ).stdout.strip()
+
+    if key:
+        # Atomic write so concurrent sessions never read a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({"key": key, "branch": branch, "commits": commits}))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Caching is best-effort
+
+    return branch, commits
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+def handle_session_start(data: dict) -> None:
+    """Inject git context for orientation."""
+    cwd = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
+
+    try:
+        branch, commits = _git_state(cwd)
 
         context = f"""# Session Context
 
@@ -121,33 +245,39 @@ def handle_pre_tool_use(data: dict) -> None:
     if tool_name == "Bash":
         command = tool_input.get("command", "")
 
-        # Simple substring patterns (always dangerous)
-        for pattern in DANGEROUS_PATTERNS:
-            if pattern in command:
+        piped_from_download = piped_to_shell = False
+        for match in _BASH_SCANNER.finditer(command):
+            pattern = match.group()
+            kind, terminators = _BASH_RULES[pattern]
+
+            # Simple substring patterns (always dangerous)
+            if kind == _DANGEROUS:
                 deny(f"Blocked dangerous pattern: {pattern}")
                 return
 
-        # Root-level commands need boundary checking
-        for pattern, terminators in DANGEROUS_ROOT_COMMANDS:
-            if pattern in command:
-                idx = command.find(pattern)
-                after = command[idx + len(pattern):idx + len(pattern) + 1] if idx + len(pattern) < len(command) else ""
+            # Root-level commands need boundary checking
+            if kind == _ROOT:
+                after = command[match.end():match.end() + 1]
                 if after in terminators:
                     deny(f"Blocked dangerous root command: {pattern}")
                     return
+            elif kind == _PIPE_SOURCE:
+                piped_from_download = True
+            else:
+                piped_to_shell = True
 
         # Check curl/wget piped to shell
-        if ("curl " in command or "wget " in command) and ("| sh" in command or "| bash" in command):
+        if piped_from_download and piped_to_shell:
             deny("Blocked: piping download to shell")
             return
 
     # Check Write/Edit for protected files
     if tool_name in {"Write", "Edit", "MultiEdit"}:
         file_path = tool_input.get("file_path", "")
-        for protected in PROTECTED_PATHS:
-            if protected in file_path:
-                deny(f"Protected file: {protected}")
-                return
+        match = _PROTECTED_SCANNER.search(file_path)
+        if match:
+            deny(f"Protected file: {match.group()}")
+            return
 
     # Default: proceed normally
     output({})
@@ -165,7 +295,6 @@ def handle_post_tool_use(data: dict) -> None:
                 from validate import run_typecheck_scoped
                 ok, errors = run_typecheck_scoped(file_path, timeout=8)
                 if not ok:
-                    from pathlib import Path
                     err_text = "\n".join(f"  {e}" for e in errors[:5])
                     output({
                         "hookSpecificOutput": {
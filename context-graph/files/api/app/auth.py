@@ -3,6 +3,9 @@
 import base64
 import hashlib
 import hmac
+import json
+import time
+from functools import lru_cache
 from urllib.parse import quote
 
 import jwt
@@ -17,6 +20,7 @@ LOGIN_URL = "/login"
 KNOWLEDGE_ORIGIN = ""
 
 
+@lru_cache
 def _derive_access_key(secret: str) -> str:
     """Derive the access-token signing key — must match admin app's HMAC-SHA256(secret, 'access')."""
     return base64.b64encode(
@@ -24,13 +28,63 @@ def _derive_access_key(secret: str) -> str:
     ).decode()
 
 
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _int_claim(payload: dict, claim: str, label: str) -> int:
+    """Read a time claim the way PyJWT does: int() of whatever was sent."""
+    try:
+        return int(payload[claim])
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} claim ({claim}) must be an integer") from None
+
+
+def _verify_hs256(token: str, key: str) -> dict:
+    """Verify an HS256 JWT with a single HMAC, mirroring PyJWT's checks.
+
+    iat, nbf and exp are validated like PyJWT 2.9 with no leeway, including
+    int() coercion of numeric strings. A null time claim is rejected with
+    ValueError where PyJWT would raise TypeError.
+
+    Tokens with any other ``alg`` header go through PyJWT, which rejects them.
+    Raises ValueError (or jwt.InvalidTokenError) on failure.
+    """
+    header_b64, payload_b64, signature_b64 = token.split(".")
+    header = json.loads(_b64url_decode(header_b64))
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        return jwt.decode(token, key, algorithms=["HS256"])
+
+    # PyJWT uses a str key as its UTF-8 bytes, so the admin app's tokens verify the same way
+    expected = hmac.new(key.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(_b64url_decode(signature_b64), expected):
+        raise ValueError("Signature verification failed")
+
+    payload = json.loads(_b64url_decode(payload_b64))
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid payload")
+
+    # Same order and int() coercion as PyJWT 2.9's _validate_claims (zero leeway)
+    now = time.time()
+    if "iat" in payload:
+        if _int_claim(payload, "iat", "Issued At") > now:
+            raise ValueError("The token is not yet valid (iat)")
+    if "nbf" in payload:
+        if _int_claim(payload, "nbf", "Not Before") > now:
+            raise ValueError("The token is not yet valid (nbf)")
+    if "exp" in payload:
+        if _int_claim(payload, "exp", "Expiration Time") <= now:
+            raise ValueError("Signature has expired")
+    return payload
+
+
 def _verify_token(token: str) -> dict:
     """Verify a JWT token and return its payload. Raises ValueError on failure."""
     settings = get_settings()
     if not settings.jwt_secret:
         raise ValueError("JWT_SECRET not configured")
     key = _derive_access_key(settings.jwt_secret)
-    return jwt.decode(token, key, algorithms=["HS256"])
+    return _verify_hs256(token, key)
 
 
 @router.get("/auth/verify")
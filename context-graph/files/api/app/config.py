@@ -1,6 +1,7 @@
 """Knowledge Graph - Configuration"""
 
 from functools import lru_cache
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -14,6 +15,10 @@ class Settings(BaseSettings):
     postgres_user: str = "knowledge"
     postgres_password: str = ""
     postgres_db: str = "knowledge"
+    # Connection pool bounds. Keep the max above 2 x fanout_concurrency so a
+    # fan-out search leaves connections for other requests.
+    db_pool_min: int = 2
+    db_pool_max: int = 20
 
     # Qdrant
     qdrant_host: str = "kg-qdrant"
@@ -28,8 +33,22 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     openai_api_key: str = ""
     extraction_model: str = "claude-sonnet-4-20250514"
+    extraction_concurrency: int = 8  # Max chunk extraction requests in flight
+    extraction_chunks_per_request: int = Field(4, ge=1, le=16)  # Chunks packed into one extraction request
+    # Output token cap per extraction request. Must stay within the model's
+    # output limit and under the SDK's ~21k-token ceiling for non-streaming calls
+    extraction_max_tokens: int = Field(16384, ge=1024, le=21333)
+    extraction_max_retries: int = 5  # Anthropic client retries on rate limit, overload, connection errors
+    # Send document extraction through the Message Batches API (half price, but
+    # processing waits until the batch ends, which can take hours)
+    extraction_use_batch_api: bool = False
+    extraction_cache_size: int = 1024  # Recent chunk extraction results kept in memory (0 disables)
     embedding_model: str = "text-embedding-3-small"
     embedding_dimensions: int = 1536
+    embedding_batch_size: int = 256  # Max texts per embeddings request
+    embedding_concurrency: int = 8  # Max embeddings requests in flight per call
+    embedding_cache_size: int = 256  # Recent embeddings kept in memory (0 disables)
+    embedding_cache_ttl_days: int = 90  # Stored chunk embeddings unused this long are pruned (0 keeps them)
 
     # Auth
     jwt_secret: str = ""
@@ -38,6 +57,10 @@ class Settings(BaseSettings):
     chunk_size: int = 500
     chunk_overlap: int = 50
 
+    # Search
+    fanout_concurrency: int = 8  # Max projects searched at once by /search fan-out
+    cypher_max_len: int = 16384  # Max characters accepted by /query/cypher
+
     @property
     def postgres_dsn(self) -> str:
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
@@ -3,19 +3,24 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+import orjson
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
+from app.models import DocumentCreate
 from app.services.database import Database
 from app.services.vector import VectorService
+from app.services.chunking import ChunkingService
 from app.services.embedding import EmbeddingService
 from app.services.extraction import ExtractionService
 from app.services.graph import GraphService
 from app.auth import router as auth_router
 from app.routers import projects, documents, knowledge, search, visualization, snapshots
 from app.services.snapshot import SnapshotService
+from app.services.search import SearchService
 
 structlog.configure(
     processors=[
@@ -23,7 +28,8 @@ structlog.configure(
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer(),
+        # stdlib logging wants str, so decode orjson's bytes
+        structlog.processors.JSONRenderer(serializer=lambda obj, **kw: orjson.dumps(obj, **kw).decode()),
     ],
     wrapper_class=structlog.stdlib.BoundLogger,
     context_class=dict,
@@ -37,17 +43,28 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     log.info("Starting Knowledge Graph API")
+    if not settings.jwt_secret:
+        log.warning("JWT_SECRET not configured, /auth/verify will reject every token")
     app.state.db = Database(settings)
     await app.state.db.connect()
     app.state.vector = VectorService(settings)
     app.state.embedding = EmbeddingService(settings)
+    app.state.chunker = ChunkingService(chunk_size=500, chunk_overlap=50)
     app.state.extraction = ExtractionService(settings)
     app.state.graph = GraphService(app.state.db)
     app.state.snapshot = SnapshotService(app.state.db, app.state.graph)
+    app.state.search = SearchService(
+        db=app.state.db,
+        graph=app.state.graph,
+        vector=app.state.vector,
+        embedding=app.state.embedding,
+    )
     await app.state.snapshot.ensure_table()
     log.info("Services initialized", postgres=settings.postgres_host, qdrant=settings.qdrant_host)
     yield
     log.info("Shutting down")
+    await app.state.embedding.close()
+    await app.state.extraction.close()
     await app.state.db.disconnect()
 
 
@@ -56,8 +73,29 @@ app = FastAPI(
     description="Knowledge Graph API - Hybrid graph + vector search with RAG",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson renders the (already jsonable-encoded) bodies of every route
+    default_response_class=ORJSONResponse,
 )
 
+_default_openapi = app.openapi
+
+
+def openapi() -> dict:
+    """OpenAPI schema plus the request models that routes parse by hand.
+
+    Their JSON schemas are generated here, on the first /openapi.json
+    request (FastAPI caches the result), instead of at import.
+    """
+    if app.openapi_schema is None:
+        schemas = _default_openapi().setdefault("components", {}).setdefault("schemas", {})
+        schemas["DocumentCreate"] = DocumentCreate.model_json_schema(
+            ref_template="#/components/schemas/{model}"
+        )
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -78,7 +116,12 @@ app.include_router(snapshots.router, prefix="/api/v1/projects/{slug}", tags=["sn
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": settings.app_name, "version": "1.0.0"}
+    return {
+        "status": "healthy",
+        "service": settings.app_name,
+        "version": "1.0.0",
+        "db_pool": app.state.db.pool_stats(),
+    }
 
 
 @app.get("/")
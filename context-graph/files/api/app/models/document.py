@@ -24,6 +24,10 @@ class DocumentCreate(DocumentBase):
 
     raw_content: str = Field(..., min_length=1)
 
+    # Parsed by hand in create_document rather than as a FastAPI body param,
+    # so nothing builds it at route registration
+    model_config = {"defer_build": True}
+
 
 class Document(DocumentBase):
     """Document database model."""
@@ -50,10 +54,17 @@ class DocumentResponse(BaseModel):
     metadata: dict
     processed: bool
     processed_at: Optional[datetime]
+    # Why processing failed when processed is false, or why entity
+    # extraction failed when processed is true and extraction_status is "failed"
     error_message: Optional[str]
     created_at: datetime
     chunk_count: Optional[int] = None
     entity_count: Optional[int] = None
+    # Entity extraction outcome: "pending" (batch mode, still running),
+    # "completed" or "failed" (see error_message); None if never run
+    extraction_status: Optional[str] = None
+
+    model_config = {"defer_build": True}
 
 
 class DocumentListResponse(BaseModel):
@@ -62,6 +73,8 @@ class DocumentListResponse(BaseModel):
     documents: list[DocumentResponse]
     total: int
 
+    model_config = {"defer_build": True}
+
 
 class ProcessDocumentResponse(BaseModel):
     """Document processing result."""
@@ -71,3 +84,6 @@ class ProcessDocumentResponse(BaseModel):
     entities_extracted: int
     relationships_created: int
     duration_ms: int
+    extraction_status: Optional[str] = None
+
+    model_config = {"defer_build": True}
@@ -63,6 +63,8 @@ class EntityResponse(BaseModel):
     properties: dict
     connections: list["ConnectionResponse"] = []
 
+    model_config = {"defer_build": True}
+
 
 class ConnectionResponse(BaseModel):
     """Connected entity summary."""
@@ -73,6 +75,8 @@ class ConnectionResponse(BaseModel):
     relationship: str
     direction: Literal["outgoing", "incoming"]
 
+    model_config = {"defer_build": True}
+
 
 class RelationshipBase(BaseModel):
     """Base relationship fields."""
@@ -106,6 +110,8 @@ class EntityListResponse(BaseModel):
     page: int
     page_size: int
 
+    model_config = {"defer_build": True}
+
 
 class RelationshipListResponse(BaseModel):
     """List of relationships response."""
@@ -113,6 +119,8 @@ class RelationshipListResponse(BaseModel):
     relationships: list[Relationship]
     total: int
 
+    model_config = {"defer_build": True}
+
 
 # ============================================================================
 # v2 Models — Batch, Upsert, Update, Deduplication
@@ -170,6 +178,8 @@ class BatchCreateResponse(BaseModel):
     relationships_created: list[dict] = []
     errors: list[str] = []
 
+    model_config = {"defer_build": True}
+
 
 class BatchDeleteRequest(BaseModel):
     """Batch delete request."""
@@ -187,6 +197,8 @@ class UpsertResponse(BaseModel):
     created: bool
     merged_properties: list[str] = []
 
+    model_config = {"defer_build": True}
+
 
 class DeduplicateRequest(BaseModel):
     """Deduplication request."""
@@ -203,6 +215,8 @@ class DuplicateGroup(BaseModel):
     entities: list[dict]
     recommended_keep: str
 
+    model_config = {"defer_build": True}
+
 
 class DeduplicateResponse(BaseModel):
     """Deduplication result."""
@@ -211,6 +225,4 @@ class DeduplicateResponse(BaseModel):
     total_duplicates: int = 0
     merged: int = 0
 
-
-# Forward reference update
-EntityResponse.model_rebuild()
+    model_config = {"defer_build": True}
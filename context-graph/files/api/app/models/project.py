@@ -47,9 +47,14 @@ class ProjectResponse(BaseModel):
     updated_at: datetime
     stats: Optional[dict] = None  # Node/edge counts
 
+    model_config = {"defer_build": True}
+
 
 class ProjectListResponse(BaseModel):
     """List of projects response."""
 
     projects: list[ProjectResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?after= to fetch the next page
+
+    model_config = {"defer_build": True}
@@ -35,6 +35,8 @@ class SearchResultConnection(BaseModel):
     name: str
     relationship: str
 
+    model_config = {"defer_build": True}
+
 
 class SearchResult(BaseModel):
     """Single search result."""
@@ -49,6 +51,8 @@ class SearchResult(BaseModel):
     connections: list[SearchResultConnection] = []
     project: Optional[str] = None
 
+    model_config = {"defer_build": True}
+
 
 class SearchStats(BaseModel):
     """Search statistics."""
@@ -57,6 +61,8 @@ class SearchStats(BaseModel):
     graph_hits: int
     total_time_ms: int
 
+    model_config = {"defer_build": True}
+
 
 class SearchResponse(BaseModel):
     """Search response."""
@@ -64,6 +70,8 @@ class SearchResponse(BaseModel):
     results: list[SearchResult]
     stats: SearchStats
 
+    model_config = {"defer_build": True}
+
 
 class ProjectSearchStats(BaseModel):
     """Per-project stats in fan-out search."""
@@ -71,6 +79,8 @@ class ProjectSearchStats(BaseModel):
     project: str
     result_count: int
 
+    model_config = {"defer_build": True}
+
 
 class FanoutSearchResponse(BaseModel):
     """Fan-out search response across all projects."""
@@ -80,6 +90,8 @@ class FanoutSearchResponse(BaseModel):
     projects_searched: int
     project_stats: list[ProjectSearchStats]
 
+    model_config = {"defer_build": True}
+
 
 class CypherRequest(BaseModel):
     """Raw Cypher query request."""
@@ -93,3 +105,5 @@ class CypherResponse(BaseModel):
     results: list[dict]
     columns: list[str]
     row_count: int
+
+    model_config = {"defer_build": True}
@@ -1,12 +1,16 @@
 """Documents API router"""
 
-import json
+import asyncio
+import hashlib
 import time
 from typing import Optional
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from psycopg.errors import UndefinedColumn, UndefinedTable
 from psycopg.types.json import Jsonb
+from pydantic import ValidationError
 import structlog
 
 from app.models.document import (
@@ -15,28 +19,187 @@ from app.models.document import (
     DocumentListResponse,
     ProcessDocumentResponse,
 )
-from app.services.chunking import ChunkingService
+from app.models.entity import EntityCreate
+from app.routers.utils import get_project_ref
+from app.services.vector import ChunkRecord
 
 log = structlog.get_logger()
 
 router = APIRouter()
 
+# Kept as one constant so every call sends identical query text and reuses the
+# plan psycopg prepared on the pooled connection
+INSERT_CHUNK_SQL = """
+    INSERT INTO public.chunks (id, document_id, content, chunk_index, token_count, qdrant_point_id, metadata)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
 
-async def get_project_id(db, slug: str) -> UUID:
-    """Get project ID from slug, raise 404 if not found."""
-    row = await db.fetch_one(
-        "SELECT id, graph_name FROM public.projects WHERE slug = %s",
-        (slug,)
+# Used instead of documents.chunk_count on databases that predate
+# 003_chunk_count.sql. Correlated per row, served by idx_chunks_document.
+CHUNK_COUNT_SUBQUERY = "(SELECT COUNT(*) FROM public.chunks c WHERE c.document_id = d.id)"
+
+# list/create/get build their responses with model_construct from trusted rows.
+# They declare response_model=None (schema kept via `responses`) so FastAPI
+# serializes the returned model directly instead of validating it again.
+
+
+async def embed_chunks(db, embedding, texts: list[str]) -> list[list[float]]:
+    """Embed chunk texts, reusing vectors cached for identical content."""
+    if not embedding.client:
+        # Placeholder zero vectors must not end up in the cache
+        return await embedding.embed_texts(texts)
+
+    prefix = f"{embedding.model}\0".encode()
+    keys = [hashlib.blake2b(prefix + text.encode(), digest_size=16).digest() for text in texts]
+
+    try:
+        rows = await db.fetch_all(
+            "SELECT content_hash, embedding FROM public.embedding_cache WHERE content_hash = ANY(%s)",
+            (list(set(keys)),)
+        )
+    except UndefinedTable:
+        # Database predates 004_embedding_cache.sql — embed everything
+        log.warning("Embedding cache table missing, skipping cache")
+        return await embedding.embed_texts(texts)
+    vectors = {bytes(r["content_hash"]): r["embedding"] for r in rows}
+
+    missing: dict[bytes, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+
+    if missing:
+        fresh = dict(zip(missing, await embedding.embed_texts(list(missing.values()))))
+        vectors.update(fresh)
+        try:
+            await db.execute_many(
+                "INSERT INTO public.embedding_cache (content_hash, embedding) VALUES (%s, %s) ON CONFLICT (content_hash) DO NOTHING",
+                list(fresh.items()),
+            )
+        except UndefinedTable:
+            log.warning("Embedding cache table missing, fresh embeddings not cached")
+
+    await refresh_embedding_cache(
+        db, [key for key in vectors if key not in missing], embedding.settings.embedding_cache_ttl_days
     )
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Project '{slug}' not found"
+
+    log.info("Embedding cache", hits=len(texts) - len(missing), misses=len(missing))
+    return [vectors[key] for key in keys]
+
+
+async def refresh_embedding_cache(db, hit_keys: list[bytes], ttl_days: int) -> None:
+    """Mark cache hits as used and drop entries unused for ttl_days (0 keeps them)."""
+    try:
+        if hit_keys:
+            # At most one write per entry per day, however often it is hit
+            await db.execute(
+                "UPDATE public.embedding_cache SET last_used_at = NOW() "
+                "WHERE content_hash = ANY(%s) AND last_used_at < NOW() - INTERVAL '1 day'",
+                (hit_keys,)
+            )
+        if ttl_days > 0:
+            await db.execute(
+                "DELETE FROM public.embedding_cache WHERE last_used_at < NOW() - make_interval(days => %s)",
+                (ttl_days,)
+            )
+    except (UndefinedColumn, UndefinedTable):
+        # Database predates 007_embedding_cache_last_used.sql (or 004) — nothing to prune by
+        log.warning("Cannot prune embedding cache")
+
+
+async def extract_entities(
+    extraction, graph, graph_name: str, document_id: UUID, filename: Optional[str],
+    content_type: str, chunk_texts: list[str],
+) -> tuple[int, int]:
+    """Extract entities from chunk texts and store them in the graph.
+
+    Returns (entities stored, relationships stored).
+    """
+    extraction_result = await extraction.extract_from_document(
+        chunks=chunk_texts,
+        content_type=content_type,
+        context={"filename": filename, "document_id": str(document_id)},
+    )
+
+    log.info(
+        "Entities extracted",
+        document_id=str(document_id),
+        entities=len(extraction_result.entities),
+        relationships=len(extraction_result.relationships),
+    )
+
+    # Store entities and relationships in one graph round-trip
+    entity_creates = [
+        EntityCreate(
+            name=entity.name,
+            type=entity.type,
+            properties={
+                **entity.properties,
+                "document_id": str(document_id),
+                "source": filename,
+            },
         )
-    return row["id"], row["graph_name"]
+        for entity in extraction_result.entities
+    ]
+    entity_index = {entity.temp_id: i for i, entity in enumerate(extraction_result.entities)}
+    rel_specs = [
+        (entity_index[rel.source], entity_index[rel.target], rel.type, rel.properties)
+        for rel in extraction_result.relationships
+        if rel.source in entity_index and rel.target in entity_index
+    ]
+
+    entities_extracted = 0
+    relationships_created = 0
+    created_ids = await graph.create_subgraph(graph_name, entity_creates, rel_specs)
+    if created_ids:
+        entities_extracted = len(created_ids)
+        relationships_created = len(rel_specs)
+
+    log.info(
+        "Graph updated",
+        document_id=str(document_id),
+        entities_stored=entities_extracted,
+        relationships_stored=relationships_created,
+    )
+    return entities_extracted, relationships_created
+
 
+async def set_extraction_status(db, document_id: UUID, extraction_status: str, error: Optional[str] = None) -> None:
+    """Record background extraction progress on the document row.
 
-@router.get("", response_model=DocumentListResponse)
+    The row is already processed, so error_message holds the extraction
+    error while the status is "failed" and is cleared otherwise.
+    """
+    try:
+        await db.execute(
+            "UPDATE public.documents SET extraction_status = %s, error_message = %s WHERE id = %s",
+            (extraction_status, error, document_id)
+        )
+    except UndefinedColumn:
+        # Database predates 006_extraction_status.sql
+        log.warning("Cannot record extraction status", document_id=str(document_id), status=extraction_status)
+
+
+async def run_background_extraction(
+    db, extraction, graph, graph_name: str, document_id: UUID, filename: Optional[str],
+    content_type: str, chunk_texts: list[str],
+) -> None:
+    """Run Phase 2 after the response was sent (batch mode)."""
+    try:
+        await extract_entities(extraction, graph, graph_name, document_id, filename, content_type, chunk_texts)
+    except Exception as e:
+        log.error("Background entity extraction failed", document_id=str(document_id), error=str(e))
+        await set_extraction_status(db, document_id, "failed", str(e))
+    else:
+        await set_extraction_status(db, document_id, "completed")
+
+
+async def get_project_id(db, slug: str) -> tuple[UUID, str]:
+    """Get (project ID, graph name) from slug, raise 404 if not found."""
+    return await get_project_ref(db, slug)
+
+
+@router.get("", response_model=None, responses={200: {"model": DocumentListResponse}})
 async def list_documents(
     slug: str,
     request: Request,
@@ -49,61 +212,105 @@ async def list_documents(
     db = request.app.state.db
     project_id, _ = await get_project_id(db, slug)
 
-    # Build query with filters
-    query = "SELECT * FROM public.documents WHERE project_id = %s"
+    # Build filters
+    where = "d.project_id = %s"
     params = [project_id]
 
     if content_type:
-        query += " AND content_type = %s"
+        where += " AND d.content_type = %s"
         params.append(content_type)
 
     if processed is not None:
-        query += " AND processed = %s"
+        where += " AND d.processed = %s"
         params.append(processed)
 
-    query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-    params.extend([limit, offset])
-
-    rows = await db.fetch_all(query, tuple(params))
+    # One round-trip: chunk_count is trigger-maintained, total via window function
+    query = """
+        SELECT d.id, d.filename, d.content_type, d.source_url, d.metadata,
+               d.processed, d.processed_at, d.error_message, d.created_at,
+               {chunk_count} AS chunk_count, {extraction_status} AS extraction_status,
+               COUNT(*) OVER () AS total
+        FROM public.documents d
+        WHERE {where}
+        ORDER BY d.created_at DESC
+        LIMIT %s OFFSET %s
+    """
 
-    documents = []
-    for row in rows:
-        # Get chunk count
-        chunk_count = await db.fetch_one(
-            "SELECT COUNT(*) as count FROM public.chunks WHERE document_id = %s",
-            (row["id"],)
+    async def fetch(chunk_count: str, extraction_status: str) -> list[dict]:
+        return await db.fetch_all(
+            query.format(chunk_count=chunk_count, extraction_status=extraction_status, where=where),
+            (*params, limit, offset)
         )
 
-        documents.append(
-            DocumentResponse(
-                id=row["id"],
-                filename=row["filename"],
-                content_type=row["content_type"],
-                source_url=row["source_url"],
-                metadata=row["metadata"] or {},
-                processed=row["processed"],
-                processed_at=row["processed_at"],
-                error_message=row["error_message"],
-                created_at=row["created_at"],
-                chunk_count=chunk_count["count"] if chunk_count else 0,
-            )
+    try:
+        rows = await fetch("d.chunk_count", "d.extraction_status")
+    except UndefinedColumn:
+        # Database predates 006_extraction_status.sql
+        try:
+            rows = await fetch("d.chunk_count", "NULL")
+        except UndefinedColumn:
+            # Database predates 003_chunk_count.sql too — count in the same query
+            rows = await fetch(CHUNK_COUNT_SUBQUERY, "NULL")
+
+    # Rows come straight from our own schema, so skip per-row validation
+    documents = [
+        DocumentResponse.model_construct(
+            id=row["id"],
+            filename=row["filename"],
+            content_type=row["content_type"],
+            source_url=row["source_url"],
+            metadata=row["metadata"] or {},
+            processed=row["processed"],
+            processed_at=row["processed_at"],
+            error_message=row["error_message"],
+            created_at=row["created_at"],
+            chunk_count=row["chunk_count"],
+            extraction_status=row["extraction_status"],
         )
-
-    # Get total count
-    count_row = await db.fetch_one(
-        "SELECT COUNT(*) as total FROM public.documents WHERE project_id = %s",
-        (project_id,)
-    )
-
-    return DocumentListResponse(
-        documents=documents,
-        total=count_row["total"] if count_row else 0
-    )
-
-
-@router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
-async def create_document(slug: str, document: DocumentCreate, request: Request):
+        for row in rows
+    ]
+
+    if rows:
+        total = rows[0]["total"]
+    elif offset:
+        # Paged past the end — the window function had no rows to count
+        count_row = await db.fetch_one(
+            f"SELECT COUNT(*) as total FROM public.documents d WHERE {where}",
+            tuple(params)
+        )
+        total = count_row["total"] if count_row else 0
+    else:
+        total = 0
+
+    return DocumentListResponse.model_construct(documents=documents, total=total)
+
+
+@router.post(
+    "",
+    response_model=None,
+    responses={201: {"model": DocumentResponse}},
+    status_code=status.HTTP_201_CREATED,
+    # The body is parsed in the handler, so declare it by hand. The schema it
+    # points to is added when the OpenAPI document is first built (app.main)
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/DocumentCreate"}}},
+        }
+    },
+)
+async def create_document(slug: str, request: Request):
     """Upload a new document."""
+    # Validate straight from the raw bytes — raw_content can be large, and
+    # this skips building an intermediate dict with json.loads
+    try:
+        document = DocumentCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Prefix locations with "body" as FastAPI does for body parameters
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
     db = request.app.state.db
     project_id, _ = await get_project_id(db, slug)
 
@@ -123,7 +330,7 @@ async def create_document(slug: str, document: DocumentCreate, request: Request)
         )
     )
 
-    return DocumentResponse(
+    return DocumentResponse.model_construct(
         id=row["id"],
         filename=row["filename"],
         content_type=row["content_type"],
@@ -136,7 +343,7 @@ async def create_document(slug: str, document: DocumentCreate, request: Request)
     )
 
 
-@router.get("/{document_id}", response_model=DocumentResponse)
+@router.get("/{document_id}", response_model=None, responses={200: {"model": DocumentResponse}})
 async def get_document(slug: str, document_id: UUID, request: Request):
     """Get a document by ID."""
     db = request.app.state.db
@@ -153,13 +360,16 @@ async def get_document(slug: str, document_id: UUID, request: Request):
             detail=f"Document '{document_id}' not found"
         )
 
-    # Get chunk count
-    chunk_count = await db.fetch_one(
-        "SELECT COUNT(*) as count FROM public.chunks WHERE document_id = %s",
-        (document_id,)
-    )
+    chunk_count = row.get("chunk_count")
+    if chunk_count is None:
+        # Database predates 003_chunk_count.sql
+        count_row = await db.fetch_one(
+            "SELECT COUNT(*) as count FROM public.chunks WHERE document_id = %s",
+            (document_id,)
+        )
+        chunk_count = count_row["count"] if count_row else 0
 
-    return DocumentResponse(
+    return DocumentResponse.model_construct(
         id=row["id"],
         filename=row["filename"],
         content_type=row["content_type"],
@@ -169,7 +379,8 @@ async def get_document(slug: str, document_id: UUID, request: Request):
         processed_at=row["processed_at"],
         error_message=row["error_message"],
         created_at=row["created_at"],
-        chunk_count=chunk_count["count"] if chunk_count else 0,
+        chunk_count=chunk_count,
+        extraction_status=row.get("extraction_status"),
     )
 
 
@@ -192,20 +403,31 @@ async def delete_document(slug: str, document_id: UUID, request: Request):
             detail=f"Document '{document_id}' not found"
         )
 
-    # Delete from Qdrant
-    await vector.delete_by_document(slug, document_id)
-
-    # Delete from database (cascades to chunks)
-    await db.execute(
-        "DELETE FROM public.documents WHERE id = %s",
-        (document_id,)
+    # Delete from database (cascades to chunks) and Qdrant concurrently. The
+    # DB delete goes first so its query is in flight while the Qdrant client blocks.
+    await asyncio.gather(
+        db.execute(
+            "DELETE FROM public.documents WHERE id = %s",
+            (document_id,)
+        ),
+        vector.delete_by_document(slug, document_id),
     )
 
     return None
 
 
-@router.post("/{document_id}/process", response_model=ProcessDocumentResponse)
-async def process_document(slug: str, document_id: UUID, request: Request):
+@router.post(
+    "/{document_id}/process",
+    response_model=ProcessDocumentResponse,
+    responses={202: {"model": ProcessDocumentResponse, "description": "Entity extraction queued (batch mode)"}},
+)
+async def process_document(
+    slug: str,
+    document_id: UUID,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+):
     """
     Trigger extraction pipeline for a document.
 
@@ -214,9 +436,14 @@ async def process_document(slug: str, document_id: UUID, request: Request):
     - Generates embeddings via OpenAI
     - Stores in Qdrant for semantic search
 
-    Phase 2 (TODO): Entity Extraction
+    Phase 2: Entity Extraction
     - Extract entities via Claude
     - Store entities/relationships in AGE graph
+
+    With `extraction_use_batch_api` set, Phase 2 goes through the Message
+    Batches API in the background: the response is 202 with
+    extraction_status "pending", and the document's extraction_status
+    turns "completed" or "failed" when it ends.
     """
     start_time = time.time()
 
@@ -254,25 +481,30 @@ async def process_document(slug: str, document_id: UUID, request: Request):
         )
 
         if existing_chunks:
-            # Delete from Qdrant
             point_ids = [row["qdrant_point_id"] for row in existing_chunks if row["qdrant_point_id"]]
-            if point_ids:
+
+            async def delete_existing_points() -> None:
+                if not point_ids:
+                    return
                 try:
                     await vector.delete_points(slug, point_ids)
                     log.info("Deleted existing Qdrant points", document_id=str(document_id), count=len(point_ids))
                 except Exception as e:
                     log.warning("Failed to delete Qdrant points", error=str(e))
 
-            # Delete from database
-            await db.execute(
-                "DELETE FROM public.chunks WHERE document_id = %s",
-                (document_id,)
+            # Delete from database and Qdrant concurrently. The DB delete goes
+            # first so its query is in flight while the Qdrant client blocks.
+            await asyncio.gather(
+                db.execute(
+                    "DELETE FROM public.chunks WHERE document_id = %s",
+                    (document_id,)
+                ),
+                delete_existing_points(),
             )
             log.info("Deleted existing chunks", document_id=str(document_id), count=len(existing_chunks))
 
         # Phase 1: Chunking
-        chunker = ChunkingService(chunk_size=500, chunk_overlap=50)
-        chunks = chunker.chunk_text(raw_content)
+        chunks = request.app.state.chunker.chunk_text(raw_content)
 
         log.info(
             "Document chunked",
@@ -298,9 +530,40 @@ async def process_document(slug: str, document_id: UUID, request: Request):
                 duration_ms=int((time.time() - start_time) * 1000),
             )
 
-        # Phase 1: Generate embeddings
-        chunk_texts = [c.content for c in chunks]
-        embeddings = await embedding.embed_texts(chunk_texts)
+        # Phase 1: Build chunk rows, Qdrant records and embedding inputs in one
+        # pass (the database rows don't depend on embeddings)
+        chunk_texts = []
+        chunk_rows = []
+        chunk_records = []
+        record_metadata = {"filename": row["filename"]}
+        for chunk in chunks:
+            chunk_id = uuid4()
+            chunk_texts.append(chunk.content)
+
+            chunk_rows.append((
+                chunk_id,
+                document_id,
+                chunk.content,
+                chunk.index,
+                chunk.token_count,
+                str(chunk_id),  # Use same ID for Qdrant
+                Jsonb({"start_char": chunk.start_char, "end_char": chunk.end_char}),
+            ))
+
+            chunk_records.append(ChunkRecord(
+                id=chunk_id,
+                document_id=document_id,
+                content=chunk.content,
+                content_type=content_type,
+                chunk_index=chunk.index,
+                metadata=record_metadata,
+            ))
+
+        # Phase 1: Generate embeddings while the chunks are written to the database
+        embeddings, _ = await asyncio.gather(
+            embed_chunks(db, embedding, chunk_texts),
+            db.execute_many(INSERT_CHUNK_SQL, chunk_rows),
+        )
 
         log.info(
             "Embeddings generated",
@@ -308,37 +571,6 @@ async def process_document(slug: str, document_id: UUID, request: Request):
             num_embeddings=len(embeddings),
         )
 
-        # Phase 1: Store chunks in database
-        chunk_records = []
-        for i, (chunk, emb) in enumerate(zip(chunks, embeddings)):
-            chunk_id = uuid4()
-
-            # Insert into database
-            await db.execute(
-                """
-                INSERT INTO public.chunks (id, document_id, content, chunk_index, token_count, qdrant_point_id, metadata)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    chunk_id,
-                    document_id,
-                    chunk.content,
-                    chunk.index,
-                    chunk.token_count,
-                    str(chunk_id),  # Use same ID for Qdrant
-                    Jsonb({"start_char": chunk.start_char, "end_char": chunk.end_char}),
-                )
-            )
-
-            chunk_records.append({
-                "id": chunk_id,
-                "document_id": document_id,
-                "content": chunk.content,
-                "content_type": content_type,
-                "chunk_index": chunk.index,
-                "metadata": {"filename": row["filename"]},
-            })
-
         # Phase 1: Store in Qdrant
         await vector.upsert_chunks(slug, chunk_records, embeddings)
 
@@ -367,75 +599,38 @@ async def process_document(slug: str, document_id: UUID, request: Request):
         # Phase 2: Entity extraction via Claude
         entities_extracted = 0
         relationships_created = 0
+        extraction_status = None
 
         extraction = request.app.state.extraction
         graph = request.app.state.graph
 
-        if extraction.client:  # Only if Anthropic API is configured
+        if not extraction.client:
+            log.info("Skipping entity extraction - Anthropic API not configured")
+        elif extraction.settings.extraction_use_batch_api:
+            # A Message Batch can take up to 24h: answer 202 now and extract
+            # in the background, tracking progress on the document row
+            extraction_status = "pending"
+            await set_extraction_status(db, document_id, extraction_status)
+            background_tasks.add_task(
+                run_background_extraction,
+                db, extraction, graph, graph_name, document_id, row["filename"], content_type, chunk_texts,
+            )
+            response.status_code = status.HTTP_202_ACCEPTED
+        else:
             try:
-                chunk_texts = [c.content for c in chunks]
-                extraction_result = await extraction.extract_from_document(
-                    chunks=chunk_texts,
-                    content_type=content_type,
-                    context={"filename": row["filename"], "document_id": str(document_id)},
-                )
-
-                log.info(
-                    "Entities extracted",
-                    document_id=str(document_id),
-                    entities=len(extraction_result.entities),
-                    relationships=len(extraction_result.relationships),
+                entities_extracted, relationships_created = await extract_entities(
+                    extraction, graph, graph_name, document_id, row["filename"], content_type, chunk_texts,
                 )
-
-                # Store entities in graph
-                entity_id_map = {}  # temp_id -> graph_id
-                for entity in extraction_result.entities:
-                    from app.models.entity import EntityCreate
-                    entity_create = EntityCreate(
-                        name=entity.name,
-                        type=entity.type,
-                        properties={
-                            **entity.properties,
-                            "document_id": str(document_id),
-                            "source": row["filename"],
-                        },
-                    )
-                    result = await graph.create_entity(graph_name, entity_create)
-                    if result:
-                        entity_id_map[entity.temp_id] = result.get("id")
-                        entities_extracted += 1
-
-                # Store relationships in graph
-                for rel in extraction_result.relationships:
-                    source_id = entity_id_map.get(rel.source)
-                    target_id = entity_id_map.get(rel.target)
-                    if source_id and target_id:
-                        from app.models.entity import RelationshipCreate
-                        rel_create = RelationshipCreate(
-                            source_id=source_id,
-                            target_id=target_id,
-                            type=rel.type,
-                            properties=rel.properties,
-                        )
-                        result = await graph.create_relationship(graph_name, rel_create)
-                        if result:
-                            relationships_created += 1
-
-                log.info(
-                    "Graph updated",
-                    document_id=str(document_id),
-                    entities_stored=entities_extracted,
-                    relationships_stored=relationships_created,
-                )
-
+                extraction_status = "completed"
+                await set_extraction_status(db, document_id, extraction_status)
             except Exception as e:
                 log.warning(
                     "Entity extraction failed, continuing without graph",
                     document_id=str(document_id),
                     error=str(e),
                 )
-        else:
-            log.info("Skipping entity extraction - Anthropic API not configured")
+                extraction_status = "failed"
+                await set_extraction_status(db, document_id, extraction_status, str(e))
 
         duration_ms = int((time.time() - start_time) * 1000)
 
@@ -445,6 +640,7 @@ async def process_document(slug: str, document_id: UUID, request: Request):
             entities_extracted=entities_extracted,
             relationships_created=relationships_created,
             duration_ms=duration_ms,
+            extraction_status=extraction_status,
         )
 
     except Exception as e:
@@ -2,7 +2,9 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.models.entity import (
     EntityCreate,
@@ -22,8 +24,9 @@ from app.models.entity import (
     DuplicateGroup,
 )
 from app.models.search import CypherRequest, CypherResponse
+from app.config import get_settings
 from app.services.graph import GraphService
-from app.routers.utils import get_graph_name, normalize_label, has_dangerous_keywords
+from app.routers.utils import ProjectRef, project_ref, normalize_label, has_dangerous_keywords
 
 router = APIRouter()
 
@@ -35,43 +38,53 @@ async def list_entities(
     type: Optional[str] = None,
     page: int = 1,
     page_size: int = 50,
+    project: ProjectRef = Depends(project_ref),
 ):
     """List entities in the project graph."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     offset = (page - 1) * page_size
 
-    entities = await graph.list_entities(
+    entities, total = await graph.list_entities_page(
         graph_name=graph_name,
         entity_type=type,
         limit=page_size,
         offset=offset,
     )
 
-    return EntityListResponse(
+    # execute_cypher returns every RETURN column on every row, so index
+    # directly; locals keep the per-row lookups out of the globals dict
+    construct = EntityResponse.model_construct
+    label = normalize_label
+    return EntityListResponse.model_construct(
         entities=[
-            EntityResponse(
-                id=str(e.get("id", "")),
-                name=e.get("name", ""),
-                type=normalize_label(e.get("type", "Unknown")),
-                properties=e.get("properties", {}),
+            construct(
+                id=str(e["id"]),
+                name=e["name"],
+                type=label(e["type"]),
+                properties=e["properties"],
                 connections=[],
             )
             for e in entities
         ],
-        total=len(entities),  # TODO: Get actual total count
+        total=total,
         page=page,
         page_size=page_size,
     )
 
 
 @router.post("/entities", response_model=EntityResponse, status_code=status.HTTP_201_CREATED)
-async def create_entity(slug: str, entity: EntityCreate, request: Request):
+async def create_entity(
+    slug: str,
+    entity: EntityCreate,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Create a new entity in the graph."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     result = await graph.create_entity(graph_name, entity)
@@ -97,6 +110,7 @@ async def find_entity(
     request: Request,
     name: str = "",
     type: Optional[str] = None,
+    project: ProjectRef = Depends(project_ref),
 ):
     """Find entities by exact name match (case-insensitive)."""
     if not name:
@@ -106,22 +120,20 @@ async def find_entity(
         )
 
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     results = await graph.find_entity_by_name(graph_name, name, entity_type=type)
 
+    label = normalize_label
     return {
         "entities": [
             {
-                "id": str(r.get("id", "")),
-                "name": r.get("name", ""),
-                "type": normalize_label(r.get("type", "Unknown")),
-                "properties": r.get("properties", {}),
-                "connections": [
-                    c for c in r.get("connections", [])
-                    if c.get("name")
-                ],
+                "id": str(r["id"]),
+                "name": r["name"],
+                "type": label(r["type"]),
+                "properties": r["properties"],
+                "connections": r["connections"],
             }
             for r in results
         ],
@@ -129,34 +141,71 @@ async def find_entity(
     }
 
 
+@router.get("/entities/stream")
+async def stream_entities(
+    slug: str,
+    request: Request,
+    type: Optional[str] = None,
+    project: ProjectRef = Depends(project_ref),
+):
+    """Stream every entity in the project graph as NDJSON (one entity per line).
+
+    Entities are fetched in id-ordered batches and written as each batch
+    arrives, so exports of large graphs never build the whole response in
+    memory.
+    """
+    graph = GraphService(request.app.state.db)
+    label = normalize_label
+
+    async def ndjson():
+        async for e in graph.iter_entities(project.graph_name, entity_type=type):
+            yield orjson.dumps({
+                "id": str(e["id"]),
+                "name": e["name"],
+                "type": label(e["type"]),
+                "properties": e["properties"],
+            }) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.delete("/entities/batch")
-async def batch_delete_entities(slug: str, batch: BatchDeleteRequest, request: Request):
+async def batch_delete_entities(
+    slug: str,
+    batch: BatchDeleteRequest,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Delete multiple entities and their relationships."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    project_id, graph_name = project
 
-    # Auto-snapshot before destructive operation
+    # Auto-snapshot before destructive operation. One transaction: the
+    # snapshot and the delete commit together or not at all.
     snapshot_service = request.app.state.snapshot
-    project = await db.fetch_one("SELECT id FROM public.projects WHERE slug = %s", (slug,))
-    if project:
+    graph = GraphService(db)
+    async with db.transaction():
         await snapshot_service.create(
-            project_id=project["id"],
+            project_id=project_id,
             graph_name=graph_name,
             label=f"Auto before batch_delete ({len(batch.entity_ids)} entities)",
             trigger="auto_pre_batch_delete",
         )
-
-    graph = GraphService(db)
-    result = await graph.batch_delete(graph_name, batch.entity_ids)
+        result = await graph.batch_delete(graph_name, batch.entity_ids)
 
     return result
 
 
 @router.post("/entities/deduplicate", response_model=DeduplicateResponse)
-async def deduplicate_entities(slug: str, dedup: DeduplicateRequest, request: Request):
+async def deduplicate_entities(
+    slug: str,
+    dedup: DeduplicateRequest,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Find and optionally merge duplicate entities."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    project_id, graph_name = project
 
     graph = GraphService(db)
     duplicates = await graph.find_duplicates(graph_name, entity_type=dedup.entity_type)
@@ -168,7 +217,7 @@ async def deduplicate_entities(slug: str, dedup: DeduplicateRequest, request: Re
             continue
         # Keep the one with lowest ID (oldest)
         sorted_entities = sorted(entities, key=lambda e: int(str(e.get("id", 0))))
-        groups.append(DuplicateGroup(
+        groups.append(DuplicateGroup.model_construct(
             name=dup.get("name", ""),
             type=normalize_label(dup.get("type", "Unknown")),
             entities=sorted_entities,
@@ -177,26 +226,34 @@ async def deduplicate_entities(slug: str, dedup: DeduplicateRequest, request: Re
 
     merged_count = 0
     if not dedup.dry_run and groups:
-        # Auto-snapshot before destructive merge
-        snapshot_service = request.app.state.snapshot
-        project = await db.fetch_one("SELECT id FROM public.projects WHERE slug = %s", (slug,))
-        if project:
-            await snapshot_service.create(
-                project_id=project["id"],
-                graph_name=graph_name,
-                label=f"Auto before deduplicate ({sum(len(g.entities) - 1 for g in groups)} duplicates)",
-                trigger="auto_pre_deduplicate",
-            )
+        merges = []
         for group in groups:
             keep_id = group.recommended_keep
             remove_ids = [str(e.get("id", "")) for e in group.entities if str(e.get("id", "")) != keep_id]
             if remove_ids:
-                await graph.merge_duplicates(graph_name, keep_id, remove_ids)
-                merged_count += len(remove_ids)
+                merges.append((keep_id, remove_ids))
+
+        # Auto-snapshot before destructive merge, committed with the merges.
+        # A failed merge rolls back the whole transaction, snapshot included
+        snapshot_service = request.app.state.snapshot
+        try:
+            async with db.transaction():
+                await snapshot_service.create(
+                    project_id=project_id,
+                    graph_name=graph_name,
+                    label=f"Auto before deduplicate ({sum(len(g.entities) - 1 for g in groups)} duplicates)",
+                    trigger="auto_pre_deduplicate",
+                )
+                merged_count = await graph.merge_duplicates_batch(graph_name, merges)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Deduplication failed, no entities were merged: {str(e)}"
+            )
 
     total_duplicates = sum(len(g.entities) - 1 for g in groups)
 
-    return DeduplicateResponse(
+    return DeduplicateResponse.model_construct(
         duplicate_groups=groups,
         total_duplicates=total_duplicates,
         merged=merged_count,
@@ -204,10 +261,15 @@ async def deduplicate_entities(slug: str, dedup: DeduplicateRequest, request: Re
 
 
 @router.get("/entities/{entity_id}", response_model=EntityResponse)
-async def get_entity(slug: str, entity_id: str, request: Request):
+async def get_entity(
+    slug: str,
+    entity_id: str,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Get an entity with its connections."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     result = await graph.get_entity(graph_name, entity_id)
@@ -241,10 +303,15 @@ async def get_entity(slug: str, entity_id: str, request: Request):
 
 
 @router.delete("/entities/{entity_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_entity(slug: str, entity_id: str, request: Request):
+async def delete_entity(
+    slug: str,
+    entity_id: str,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Delete an entity and its relationships."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     success = await graph.delete_entity(graph_name, entity_id)
@@ -264,10 +331,16 @@ async def delete_entity(slug: str, entity_id: str, request: Request):
 
 
 @router.patch("/entities/{entity_id}", response_model=EntityResponse)
-async def update_entity(slug: str, entity_id: str, update: EntityUpdate, request: Request):
+async def update_entity(
+    slug: str,
+    entity_id: str,
+    update: EntityUpdate,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Update an entity's properties (partial patch)."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
 
@@ -318,15 +391,20 @@ async def update_entity(slug: str, entity_id: str, update: EntityUpdate, request
 
 
 @router.post("/batch", response_model=BatchCreateResponse, status_code=status.HTTP_201_CREATED)
-async def batch_create(slug: str, batch: BatchCreateRequest, request: Request):
+async def batch_create(
+    slug: str,
+    batch: BatchCreateRequest,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Create multiple entities and relationships in a single atomic operation."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     result = await graph.batch_create(graph_name, batch.entities, batch.relationships)
 
-    return BatchCreateResponse(
+    return BatchCreateResponse.model_construct(
         entities_created=result.get("entities_created", []),
         relationships_created=result.get("relationships_created", []),
         errors=result.get("errors", []),
@@ -334,10 +412,16 @@ async def batch_create(slug: str, batch: BatchCreateRequest, request: Request):
 
 
 @router.put("/entities", response_model=UpsertResponse)
-async def upsert_entity(slug: str, entity: EntityCreate, request: Request, description: Optional[str] = None):
+async def upsert_entity(
+    slug: str,
+    entity: EntityCreate,
+    request: Request,
+    description: Optional[str] = None,
+    project: ProjectRef = Depends(project_ref),
+):
     """Create an entity or update if one with same name+type exists."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     result, created = await graph.upsert_entity(graph_name, entity, description)
@@ -359,26 +443,28 @@ async def get_entity_relationships(
     request: Request,
     direction: str = "all",
     type: Optional[str] = None,
+    project: ProjectRef = Depends(project_ref),
 ):
     """List all relationships for a specific entity."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     results = await graph.get_entity_relationships(
         graph_name, entity_id, direction=direction, rel_type=type
     )
 
+    label = normalize_label
     return {
         "relationships": [
             {
-                "id": str(r.get("id", "")),
-                "type": r.get("type", ""),
-                "direction": r.get("direction", ""),
-                "other_id": str(r.get("other_id", "")),
-                "other_name": r.get("other_name", ""),
-                "other_type": normalize_label(r.get("other_type", "Unknown")),
-                "properties": r.get("properties", {}),
+                "id": str(r["id"]),
+                "type": r["type"],
+                "direction": r["direction"],
+                "other_id": str(r["other_id"]),
+                "other_name": r["other_name"],
+                "other_type": label(r["other_type"]),
+                "properties": r["properties"],
             }
             for r in results
         ],
@@ -391,17 +477,18 @@ async def list_relationships(
     slug: str,
     request: Request,
     limit: int = 100,
+    project: ProjectRef = Depends(project_ref),
 ):
     """List relationships in the project graph."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
-    relationships = await graph.list_relationships(graph_name, limit=limit)
+    relationships, total = await graph.list_relationships_page(graph_name, limit=limit)
 
-    return RelationshipListResponse(
+    return RelationshipListResponse.model_construct(
         relationships=[
-            Relationship(
+            Relationship.model_construct(
                 id=str(r.get("id", "")),
                 source_id=str(r.get("source_id", "")),
                 target_id=str(r.get("target_id", "")),
@@ -410,15 +497,20 @@ async def list_relationships(
             )
             for r in relationships
         ],
-        total=len(relationships),
+        total=total,
     )
 
 
 @router.post("/relationships", response_model=Relationship, status_code=status.HTTP_201_CREATED)
-async def create_relationship(slug: str, rel: RelationshipCreate, request: Request):
+async def create_relationship(
+    slug: str,
+    rel: RelationshipCreate,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Create a relationship between entities."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
 
     graph = GraphService(db)
     result = await graph.create_relationship(graph_name, rel)
@@ -438,11 +530,24 @@ async def create_relationship(slug: str, rel: RelationshipCreate, request: Reque
     )
 
 
-@router.post("/query/cypher", response_model=CypherResponse)
-async def execute_cypher(slug: str, query: CypherRequest, request: Request):
+@router.post("/query/cypher", response_model=None, responses={200: {"model": CypherResponse}})
+async def execute_cypher(
+    slug: str,
+    query: CypherRequest,
+    request: Request,
+    project: ProjectRef = Depends(project_ref),
+):
     """Execute a raw Cypher query."""
     db = request.app.state.db
-    graph_name = await get_graph_name(db, slug)
+    graph_name = project.graph_name
+
+    # Reject oversized queries before scanning them or touching the database
+    max_len = get_settings().cypher_max_len
+    if len(query.query) > max_len:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Cypher query exceeds {max_len} characters"
+        )
 
     # Security: word-boundary keyword check (safe against substrings like 'dataset')
     if has_dangerous_keywords(query.query):
@@ -454,11 +559,13 @@ async def execute_cypher(slug: str, query: CypherRequest, request: Request):
     try:
         results = await db.execute_cypher(graph_name, query.query)
 
-        return CypherResponse(
+        response = CypherResponse.model_construct(
             results=results,
             columns=list(results[0].keys()) if results else [],
             row_count=len(results),
         )
+        # Serialized directly by pydantic-core; arbitrary result rows skip re-validation
+        return Response(content=response.model_dump_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,6 +1,9 @@
 """Projects API router"""
 
+import asyncio
+import base64
 import re
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
@@ -8,33 +11,76 @@ from fastapi import APIRouter, HTTPException, Request, status
 from psycopg.types.json import Jsonb
 
 from app.models.project import ProjectCreate, ProjectResponse, ProjectListResponse
+from app.routers.utils import etag_response, invalidate_project
 from app.services.graph import GraphService
 
 router = APIRouter()
 
+# Project reads go out with an ETag (response_model=None, schema kept via
+# `responses`) so unchanged lists and projects come back as 304s
+
+# Upper bound for ?limit= on the project list
+MAX_PROJECT_PAGE = 500
+
+_SLUG_STRIP = re.compile(r"[^a-z0-9\s-]")
+_SLUG_SPACE = re.compile(r"[\s_]+")
+_SLUG_DASH = re.compile(r"-+")
+
 
 def slugify(name: str) -> str:
     """Convert name to URL-safe slug."""
     slug = name.lower()
-    slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"-+", "-", slug)
+    slug = _SLUG_STRIP.sub("", slug)
+    slug = _SLUG_SPACE.sub("-", slug)
+    slug = _SLUG_DASH.sub("-", slug)
     return slug.strip("-")
 
 
-@router.get("", response_model=ProjectListResponse)
-async def list_projects(request: Request):
-    """List all projects."""
-    db = request.app.state.db
+@router.get("", response_model=None, responses={200: {"model": ProjectListResponse}})
+async def list_projects(request: Request, after: Optional[str] = None, limit: int = 100):
+    """List projects, oldest first, a page at a time.
 
-    rows = await db.fetch_all(
-        "SELECT * FROM public.projects ORDER BY created_at ASC"
-    )
+    `after` is the opaque `next_cursor` of the previous page. Pages are
+    keyset paginated on (created_at, id), so deep pages cost the same as
+    the first.
+    """
+    db = request.app.state.db
+    limit = max(1, min(limit, MAX_PROJECT_PAGE))
+
+    if after:
+        try:
+            created_at, _, project_id = base64.urlsafe_b64decode(after).decode().rpartition(",")
+            cursor = (datetime.fromisoformat(created_at), UUID(project_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid cursor '{after}'"
+            )
+        rows = await db.fetch_all(
+            """
+            SELECT *, (SELECT COUNT(*) FROM public.projects) AS total
+            FROM public.projects
+            WHERE (created_at, id) > (%s, %s)
+            ORDER BY created_at ASC, id ASC
+            LIMIT %s
+            """,
+            (*cursor, limit)
+        )
+    else:
+        rows = await db.fetch_all(
+            """
+            SELECT *, (SELECT COUNT(*) FROM public.projects) AS total
+            FROM public.projects
+            ORDER BY created_at ASC, id ASC
+            LIMIT %s
+            """,
+            (limit,)
+        )
 
     projects = []
     for row in rows:
         projects.append(
-            ProjectResponse(
+            ProjectResponse.model_construct(
                 id=row["id"],
                 name=row["name"],
                 slug=row["slug"],
@@ -46,7 +92,21 @@ async def list_projects(request: Request):
             )
         )
 
-    return ProjectListResponse(projects=projects, total=len(projects))
+    if rows:
+        total = rows[0]["total"]
+    elif after:
+        # Past the last page there are no rows to carry the total
+        total = (await db.fetch_one("SELECT COUNT(*) AS total FROM public.projects"))["total"]
+    else:
+        total = 0
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = base64.urlsafe_b64encode(f"{last['created_at'].isoformat()},{last['id']}".encode()).decode()
+
+    response = ProjectListResponse.model_construct(projects=projects, total=total, next_cursor=next_cursor)
+    return etag_response(request, response)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -59,35 +119,39 @@ async def create_project(project: ProjectCreate, request: Request):
     slug = project.slug or slugify(project.name)
     graph_name = f"project_{slug.replace('-', '_')}"
 
-    # Check if slug exists
-    existing = await db.fetch_one(
-        "SELECT id FROM public.projects WHERE slug = %s",
-        (slug,)
-    )
-    if existing:
+    # The Qdrant collection only depends on the slug: start creating it now so
+    # the blocking client call runs while the INSERT is in flight
+    collection_task = asyncio.create_task(vector.create_collection(slug))
+
+    # Create project record (the unique slug doubles as the existence check)
+    try:
+        row = await db.fetch_one(
+            """
+            INSERT INTO public.projects (name, slug, graph_name, description, settings)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (slug) DO NOTHING
+            RETURNING *
+            """,
+            (project.name, slug, graph_name, project.description, Jsonb(project.settings) if project.settings else None)
+        )
+    except Exception:
+        collection_task.cancel()
+        raise
+    if not row:
+        # Creating a collection is idempotent, so one already kicked off for
+        # the existing project is harmless
+        collection_task.cancel()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Project with slug '{slug}' already exists"
         )
 
-    # Create project record
-    row = await db.fetch_one(
-        """
-        INSERT INTO public.projects (name, slug, graph_name, description, settings)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING *
-        """,
-        (project.name, slug, graph_name, project.description, Jsonb(project.settings) if project.settings else None)
-    )
+    invalidate_project(slug)
 
-    # Create AGE graph
     graph_service = GraphService(db)
-    await graph_service.create_graph(graph_name)
-
-    # Create Qdrant collection
-    await vector.create_collection(slug)
+    await asyncio.gather(graph_service.create_graph(graph_name), collection_task)
 
-    return ProjectResponse(
+    return ProjectResponse.model_construct(
         id=row["id"],
         name=row["name"],
         slug=row["slug"],
@@ -99,7 +163,7 @@ async def create_project(project: ProjectCreate, request: Request):
     )
 
 
-@router.get("/{slug}", response_model=ProjectResponse)
+@router.get("/{slug}", response_model=None, responses={200: {"model": ProjectResponse}})
 async def get_project(slug: str, request: Request):
     """Get a project by slug."""
     db = request.app.state.db
@@ -122,7 +186,7 @@ async def get_project(slug: str, request: Request):
     except Exception:
         stats = None
 
-    return ProjectResponse(
+    response = ProjectResponse.model_construct(
         id=row["id"],
         name=row["name"],
         slug=row["slug"],
@@ -133,6 +197,7 @@ async def get_project(slug: str, request: Request):
         updated_at=row["updated_at"],
         stats=stats,
     )
+    return etag_response(request, response)
 
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
@@ -152,17 +217,17 @@ async def delete_project(slug: str, request: Request):
             detail=f"Project '{slug}' not found"
         )
 
-    # Drop AGE graph
+    # Drop AGE graph, delete project record (cascades to documents, chunks)
+    # and delete Qdrant collection concurrently
     graph_service = GraphService(db)
-    await graph_service.drop_graph(row["graph_name"])
-
-    # Delete Qdrant collection
-    await vector.delete_collection(slug)
-
-    # Delete project record (cascades to documents, chunks)
-    await db.execute(
-        "DELETE FROM public.projects WHERE slug = %s",
-        (slug,)
+    await asyncio.gather(
+        graph_service.drop_graph(row["graph_name"]),
+        db.execute(
+            "DELETE FROM public.projects WHERE slug = %s",
+            (slug,)
+        ),
+        vector.delete_collection(slug),
     )
+    invalidate_project(slug)
 
     return None
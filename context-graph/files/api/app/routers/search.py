@@ -1,21 +1,23 @@
 """Search API router"""
 
 import asyncio
+import heapq
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from app.models.search import SearchRequest, SearchResponse, FanoutSearchResponse, ProjectSearchStats
-from app.services.graph import GraphService
-from app.services.search import SearchService
-from app.services.embedding import EmbeddingService
 from app.config import get_settings
 from app.routers.utils import get_graph_name
 
 router = APIRouter()
 fanout_router = APIRouter()
 
+# Search payloads can be large lists of results. They are serialized straight
+# to JSON by pydantic-core (response_model=None, schema kept via `responses`)
+# instead of going through FastAPI's validate + jsonable_encoder path.
 
-@router.post("", response_model=SearchResponse)
+
+@router.post("", response_model=None, responses={200: {"model": SearchResponse}})
 async def search(slug: str, search_request: SearchRequest, request: Request):
     """
     Hybrid search combining vector similarity and graph traversal.
@@ -26,28 +28,17 @@ async def search(slug: str, search_request: SearchRequest, request: Request):
     - graph: Only graph text matching
     """
     db = request.app.state.db
-    vector = request.app.state.vector
     graph_name = await get_graph_name(db, slug)
 
-    settings = get_settings()
-    graph = GraphService(db)
-    embedding = EmbeddingService(settings)
-
-    search_service = SearchService(
-        db=db,
-        graph=graph,
-        vector=vector,
-        embedding=embedding,
-    )
-
-    return await search_service.search(
+    response = await request.app.state.search.search(
         project_slug=slug,
         graph_name=graph_name,
         request=search_request,
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
-@fanout_router.post("", response_model=FanoutSearchResponse)
+@fanout_router.post("", response_model=None, responses={200: {"model": FanoutSearchResponse}})
 async def fanout_search(search_request: SearchRequest, request: Request):
     """
     Fan-out search across ALL projects.
@@ -56,36 +47,36 @@ async def fanout_search(search_request: SearchRequest, request: Request):
     sorted by score descending. Each result is tagged with its source project.
     """
     db = request.app.state.db
-    vector = request.app.state.vector
 
     # Load all projects
     rows = await db.fetch_all("SELECT slug, graph_name FROM public.projects")
     if not rows:
-        return FanoutSearchResponse(
+        response = FanoutSearchResponse.model_construct(
             results=[], total=0, projects_searched=0, project_stats=[]
         )
+        return Response(content=response.model_dump_json(), media_type="application/json")
 
     settings = get_settings()
-    graph = GraphService(db)
-    embedding_service = EmbeddingService(settings)
-    search_service = SearchService(
-        db=db, graph=graph, vector=vector, embedding=embedding_service
-    )
+    search_service = request.app.state.search
 
     # Pre-compute embedding once for all projects to avoid redundant API calls
     query_embedding = None
     if search_request.mode in ("hybrid", "vector"):
-        query_embedding = await embedding_service.embed_text(search_request.query)
+        query_embedding = await request.app.state.embedding.embed_text(search_request.query)
+
+    # Fan out searches to all projects, a bounded number at a time so large
+    # deployments don't drain the DB connection pool
+    sem = asyncio.Semaphore(settings.fanout_concurrency)
 
-    # Fan out searches to all projects
     async def search_project(slug: str, graph_name: str):
         try:
-            response = await search_service.search(
-                project_slug=slug,
-                graph_name=graph_name,
-                request=search_request,
-                embedding=query_embedding,
-            )
+            async with sem:
+                response = await search_service.search(
+                    project_slug=slug,
+                    graph_name=graph_name,
+                    request=search_request,
+                    embedding=query_embedding,
+                )
             # Tag each result with its source project
             for r in response.results:
                 r.project = slug
@@ -110,15 +101,15 @@ async def fanout_search(search_request: SearchRequest, request: Request):
                 seen_ids.add(r.id)
                 merged.append(r)
                 count += 1
-        project_stats.append(ProjectSearchStats(project=slug, result_count=count))
+        project_stats.append(ProjectSearchStats.model_construct(project=slug, result_count=count))
 
-    # Sort by score descending and apply limit
-    merged.sort(key=lambda r: r.score, reverse=True)
-    merged = merged[: search_request.limit]
+    # Top results by score descending (same order as a stable full sort)
+    merged = heapq.nlargest(search_request.limit, merged, key=lambda r: r.score)
 
-    return FanoutSearchResponse(
+    response = FanoutSearchResponse.model_construct(
         results=merged,
         total=len(merged),
         projects_searched=len(rows),
         project_stats=project_stats,
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
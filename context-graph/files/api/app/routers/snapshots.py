@@ -5,22 +5,15 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Request, status
 
 from app.models.snapshot import SnapshotCreate, SnapshotResponse, SnapshotDetail, RestoreResponse
+from app.routers.utils import get_project_ref
 
 router = APIRouter()
 
 
 async def _get_project(db, slug: str) -> dict:
     """Get project by slug."""
-    row = await db.fetch_one(
-        "SELECT id, graph_name FROM public.projects WHERE slug = %s",
-        (slug,),
-    )
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Project '{slug}' not found",
-        )
-    return dict(row)
+    project_id, graph_name = await get_project_ref(db, slug)
+    return {"id": project_id, "graph_name": graph_name}
 
 
 @router.post("/snapshots", response_model=SnapshotResponse, status_code=status.HTTP_201_CREATED)
@@ -1,14 +1,42 @@
 """Shared utilities for API routers."""
 
+import hashlib
 import re
+import time
+from typing import NamedTuple
+from uuid import UUID
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+
+# Seconds a slug -> (project_id, graph_name) lookup is reused. Bounds how long
+# other workers keep serving a project that was deleted and re-created.
+PROJECT_CACHE_TTL = 60
+
+
+class ProjectRef(NamedTuple):
+    """Resolved project identity, as used by the graph and snapshot routes."""
+
+    id: UUID
+    graph_name: str
+
+
+_project_cache: dict[str, tuple[float, ProjectRef]] = {}
 
 
 async def get_graph_name(db, slug: str) -> str:
     """Get graph name from project slug."""
+    return (await get_project_ref(db, slug)).graph_name
+
+
+async def get_project_ref(db, slug: str) -> ProjectRef:
+    """Get (project_id, graph_name) from project slug, cached per process."""
+    cached = _project_cache.get(slug)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
     row = await db.fetch_one(
-        "SELECT graph_name FROM public.projects WHERE slug = %s",
+        "SELECT id, graph_name FROM public.projects WHERE slug = %s",
         (slug,)
     )
     if not row:
@@ -16,7 +44,40 @@ async def get_graph_name(db, slug: str) -> str:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project '{slug}' not found"
         )
-    return row["graph_name"]
+    ref = ProjectRef(row["id"], row["graph_name"])
+    _project_cache[slug] = (time.monotonic() + PROJECT_CACHE_TTL, ref)
+    return ref
+
+
+async def project_ref(slug: str, request: Request) -> ProjectRef:
+    """FastAPI dependency resolving the `{slug}` path parameter.
+
+    FastAPI solves a dependency once per request, so every handler and
+    sub-dependency asking for it shares a single lookup.
+    """
+    return await get_project_ref(request.app.state.db, slug)
+
+
+def invalidate_project(slug: str) -> None:
+    """Drop a cached project lookup (call when the project is created or deleted)."""
+    _project_cache.pop(slug, None)
+
+
+def etag_response(request: Request, model: BaseModel) -> Response:
+    """Serialize a response model with an ETag, answering 304 when it matches.
+
+    ``Cache-Control: no-cache`` makes clients and proxies revalidate every
+    time, so mutations are visible immediately while unchanged bodies are
+    not re-sent.
+    """
+    body = model.model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 from app.utils import normalize_label  # noqa: F401 — re-exported for router consumers
@@ -24,20 +85,24 @@ from app.utils import normalize_label  # noqa: F401 — re-exported for router c
 
 # -- Cypher safety helpers ---------------------------------------------------
 
-DANGEROUS_KEYWORDS = {"DELETE", "CREATE", "DROP", "SET", "REMOVE", "MERGE", "DETACH", "CALL"}
+DANGEROUS_KEYWORDS = frozenset({"DELETE", "CREATE", "DROP", "SET", "REMOVE", "MERGE", "DETACH", "CALL"})
+
+# One pass over the query: comments are matched (and skipped) as whole tokens,
+# whichever kind starts first, so words inside them are never inspected
+_CYPHER_TOKENS = re.compile(r'//[^\n]*|/\*.*?\*/|\w+', re.DOTALL)
 
 
 def has_dangerous_keywords(query: str) -> bool:
     """Check for write/destructive Cypher keywords using word-boundary matching.
 
-    Strips comments first so that keyword checks cannot be bypassed via
-    ``// DELETE`` or ``/* DROP */`` style comments.  Uses word boundaries so
+    Skips comments so that keyword checks cannot be bypassed via
+    ``// DELETE`` or ``/* DROP */`` style comments.  Compares whole words so
     that benign identifiers like ``dataset`` or ``create_date`` are not
-    flagged.
+    flagged.  Words are upper-cased one at a time and the scan stops at the
+    first hit.
     """
-    # Remove single-line comments
-    cleaned = re.sub(r'//.*$', '', query, flags=re.MULTILINE)
-    # Remove block comments
-    cleaned = re.sub(r'/\*.*?\*/', '', cleaned, flags=re.DOTALL)
-    words = set(re.findall(r'\b[A-Z]+\b', cleaned.upper()))
-    return bool(words & DANGEROUS_KEYWORDS)
+    for match in _CYPHER_TOKENS.finditer(query):
+        token = match.group()
+        if token[0] != "/" and token.upper() in DANGEROUS_KEYWORDS:
+            return True
+    return False
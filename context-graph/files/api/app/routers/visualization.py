@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from app.services.graph import GraphService
@@ -58,7 +59,49 @@ TYPE_COLORS = {
 }
 
 
-@router.get("/graph", response_model=GraphVisualizationResponse)
+# Graph payloads run to thousands of nodes and edges. They are built as plain
+# dicts and rendered by orjson (response_model=None, schema kept via
+# `responses`); the models above only document the response shape.
+
+
+def _vis_node(n: dict, type_filter: Optional[frozenset[str]]) -> Optional[dict]:
+    """Visualization node for a graph row, or None if filtered out by type."""
+    node_type = normalize_label(n.get("type", "Unknown"))
+
+    # Skip if type filter specified and not matching
+    if type_filter and node_type not in type_filter:
+        return None
+
+    return {
+        "id": str(n.get("id", "")),
+        "label": n.get("name", ""),
+        "type": node_type,
+        "properties": n.get("properties", {}),
+        "color": TYPE_COLORS.get(node_type, "#6B7280"),
+    }
+
+
+def _vis_edge(e: dict, node_ids: set[int]) -> Optional[dict]:
+    """Visualization edge for a graph row, or None unless both ends are shown."""
+    source = e.get("source")
+    target = e.get("target")
+
+    # Only include edges where both nodes are in our filtered set. Ids are
+    # compared as the graph ids from the database; only kept edges pay for
+    # the str conversion.
+    if source not in node_ids or target not in node_ids:
+        return None
+
+    return {
+        "id": str(e.get("id", "")),
+        "source": str(source),
+        "target": str(target),
+        "type": e.get("type", "RELATED_TO"),
+        "properties": e.get("properties", {}),
+    }
+
+
+@router.get("/graph", response_model=None, responses={200: {"model": GraphVisualizationResponse}})
 async def get_visualization_graph(
     slug: str,
     request: Request,
@@ -81,73 +124,57 @@ async def get_visualization_graph(
 
     graph = GraphService(db)
 
-    # Parse type filter early for use in queries
-    type_filter = types.split(",") if types else None
+    # Parse type filter early for use in queries: an ordered, de-duplicated
+    # list drives the per-type queries, a set answers membership per node
+    query_types = list(dict.fromkeys(types.split(","))) if types else None
+    type_filter = frozenset(query_types) if query_types else None
+
+    # Node ids and type counts are collected as nodes are kept rather than
+    # in further passes over the list
+    nodes = []
+    node_ids: set[int] = set()
+    type_counts: dict[str, int] = {}
 
     if focus:
         # Get local neighborhood
         data = await graph.get_local_graph(graph_name, focus, depth=depth)
-    elif type_filter:
-        # Get filtered graph by types - fetch more to ensure we get all matching
-        data = await graph.get_full_graph(graph_name, limit=limit * 3, types=type_filter)
+        for n in data.get("nodes", []):
+            if node := _vis_node(n, type_filter):
+                nodes.append(node)
+                node_ids.add(n.get("id"))
+                type_counts[node["type"]] = type_counts.get(node["type"], 0) + 1
+        edges = [v for e in data.get("edges", []) if (v := _vis_edge(e, node_ids))]
     else:
-        # Get full graph
-        data = await graph.get_full_graph(graph_name, limit=limit)
-
-    # Transform to visualization format
-    nodes = []
-    for n in data.get("nodes", []):
-        node_type = normalize_label(n.get("type", "Unknown"))
-
-        # Skip if type filter specified and not matching
-        if type_filter and node_type not in type_filter:
-            continue
-
-        nodes.append(
-            GraphNode(
-                id=str(n.get("id", "")),
-                label=n.get("name", ""),
-                type=node_type,
-                properties=n.get("properties", {}),
-                color=TYPE_COLORS.get(node_type, "#6B7280"),
-            )
-        )
-
-    edges = []
-    node_ids = {n.id for n in nodes}
-    for e in data.get("edges", []):
-        source = str(e.get("source", ""))
-        target = str(e.get("target", ""))
-
-        # Only include edges where both nodes are in our filtered set
-        if source in node_ids and target in node_ids:
-            edges.append(
-                GraphEdge(
-                    id=str(e.get("id", "")),
-                    source=source,
-                    target=target,
-                    type=e.get("type", "RELATED_TO"),
-                    properties=e.get("properties", {}),
-                )
-            )
-
-    # Count types
-    type_counts = {}
-    for n in nodes:
-        type_counts[n.type] = type_counts.get(n.type, 0) + 1
-
-    return GraphVisualizationResponse(
-        nodes=nodes,
-        edges=edges,
-        stats=GraphStats(
-            node_count=len(nodes),
-            edge_count=len(edges),
-            types=type_counts,
-        ),
-    )
-
-
-@router.get("/graph/local/{entity_id}", response_model=GraphVisualizationResponse)
+        # Filtered graph by types - fetch more to ensure we get all matching
+        fetch_limit = limit * 3 if type_filter else limit
+
+        # Rows are converted as they stream in, so the raw result set is never
+        # held in memory alongside the response
+        fetched_ids = []
+        async for n in graph.iter_graph_nodes(graph_name, limit=fetch_limit, types=query_types):
+            fetched_ids.append(n.get("id"))
+            if node := _vis_node(n, type_filter):
+                nodes.append(node)
+                node_ids.add(n.get("id"))
+                type_counts[node["type"]] = type_counts.get(node["type"], 0) + 1
+
+        edges = []
+        async for e in graph.iter_graph_edges(graph_name, fetched_ids, limit=fetch_limit * 2):
+            if edge := _vis_edge(e, node_ids):
+                edges.append(edge)
+
+    return ORJSONResponse({
+        "nodes": nodes,
+        "edges": edges,
+        "stats": {
+            "node_count": len(nodes),
+            "edge_count": len(edges),
+            "types": type_counts,
+        },
+    })
+
+
+@router.get("/graph/local/{entity_id}", response_model=None, responses={200: {"model": GraphVisualizationResponse}})
 async def get_local_graph(
     slug: str,
     entity_id: str,
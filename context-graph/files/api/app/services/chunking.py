@@ -1,6 +1,7 @@
 """Text chunking service for document processing."""
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from typing import Optional
 
 import tiktoken
@@ -11,15 +12,26 @@ log = structlog.get_logger()
 # Default encoding for OpenAI models
 DEFAULT_ENCODING = "cl100k_base"
 
+# tiktoken starts a fresh thread pool for every batch encode, which only pays
+# off for large inputs; smaller batches are encoded serially
+BATCH_ENCODE_MIN_CHARS = 100_000
+
+# Sentence boundary: whitespace after ., ! or ? (the punctuation stays with the sentence)
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
 
 @dataclass
 class Chunk:
     """A chunk of text with metadata."""
     content: str
     index: int
+    # Sum of the chunk's separately encoded pieces, an upper bound on
+    # len(encode(content)) that can be a token per join higher
     token_count: int
     start_char: int
     end_char: int
+    # Token ids of `content`, kept so overlap is built without re-encoding
+    token_ids: list[int] = field(default_factory=list, repr=False)
 
 
 class ChunkingService:
@@ -45,7 +57,13 @@ class ChunkingService:
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in a text string."""
-        return len(self.encoding.encode(text))
+        return len(self.encoding.encode_ordinary(text))
+
+    def _encode_batch(self, texts: list[str]) -> list[list[int]]:
+        """Encode many texts, on tiktoken's thread pool when they are large."""
+        if sum(map(len, texts)) < BATCH_ENCODE_MIN_CHARS:
+            return [self.encoding.encode_ordinary(text) for text in texts]
+        return self.encoding.encode_ordinary_batch(texts)
 
     def chunk_text(self, text: str, metadata: Optional[dict] = None) -> list[Chunk]:
         """
@@ -70,58 +88,85 @@ class ChunkingService:
         # Normalize whitespace
         text = text.strip()
 
-        # Split into paragraphs
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        # Split into paragraphs, recording each one's offset in a single pass
+        paragraphs: list[str] = []
+        para_starts: list[int] = []
+        cursor = 0
+        for piece in text.split("\n\n"):
+            para = piece.strip()
+            if para:
+                paragraphs.append(para)
+                para_starts.append(cursor + len(piece) - len(piece.lstrip()))
+            cursor += len(piece) + 2
 
         if not paragraphs:
             return []
 
         chunks: list[Chunk] = []
-        current_chunk = ""
+        # Paragraphs of the chunk being built, joined once when it is emitted,
+        # and their token ids laid end to end
+        current_parts: list[str] = []
+        current_ids: list[int] = []
         current_start = 0
         chunk_index = 0
 
-        for para in paragraphs:
-            para_tokens = self.count_tokens(para)
+        # Each paragraph is encoded once and chunks are packed in token space,
+        # instead of re-encoding the growing chunk for every paragraph.
+        # A chunk's count is the sum of its separately encoded pieces. Tokens
+        # can merge across a join, so the count is an upper bound: the real
+        # count is equal or up to a token per join lower, and a packed chunk
+        # never goes over chunk_size.
+        sep_ids = self.encoding.encode_ordinary("\n\n")
+        para_ids = self._encode_batch(paragraphs)
+
+        for para, para_start, ids in zip(paragraphs, para_starts, para_ids):
+            fit_tokens = len(current_ids) + len(sep_ids) + len(ids) if current_parts else len(ids)
 
             # If paragraph fits in current chunk
-            if self.count_tokens(current_chunk + "\n\n" + para if current_chunk else para) <= self.chunk_size:
-                if current_chunk:
-                    current_chunk += "\n\n" + para
+            if fit_tokens <= self.chunk_size:
+                if current_parts:
+                    current_ids += sep_ids
                 else:
-                    current_chunk = para
-                    current_start = text.find(para)
+                    current_start = para_start
+                current_parts.append(para)
+                current_ids += ids
             else:
                 # Save current chunk if not empty
-                if current_chunk:
+                if current_parts:
+                    current_chunk = "\n\n".join(current_parts)
                     chunks.append(Chunk(
                         content=current_chunk,
                         index=chunk_index,
-                        token_count=self.count_tokens(current_chunk),
+                        token_count=len(current_ids),
                         start_char=current_start,
                         end_char=current_start + len(current_chunk),
+                        token_ids=current_ids,
                     ))
                     chunk_index += 1
 
                 # If paragraph itself is too long, split it
-                if para_tokens > self.chunk_size:
-                    para_chunks = self._split_long_paragraph(para, text, chunk_index)
+                if len(ids) > self.chunk_size:
+                    para_chunks = self._split_long_paragraph(para, para_start, chunk_index)
                     for pc in para_chunks:
                         chunks.append(pc)
                         chunk_index += 1
-                    current_chunk = ""
+                    current_parts = []
+                    current_ids = []
                 else:
-                    current_chunk = para
-                    current_start = text.find(para)
+                    current_parts = [para]
+                    current_ids = list(ids)
+                    current_start = para_start
 
         # Don't forget the last chunk
-        if current_chunk:
+        if current_parts:
+            current_chunk = "\n\n".join(current_parts)
             chunks.append(Chunk(
                 content=current_chunk,
                 index=chunk_index,
-                token_count=self.count_tokens(current_chunk),
+                token_count=len(current_ids),
                 start_char=current_start,
                 end_char=current_start + len(current_chunk),
+                token_ids=current_ids,
             ))
 
         # Add overlap between chunks
@@ -129,75 +174,99 @@ class ChunkingService:
 
         log.info(
             "Text chunked",
-            total_tokens=self.count_tokens(text),
+            # Same additive count as the packing; avoids encoding the whole
+            # document again just for this log line
+            total_tokens=sum(map(len, para_ids)) + len(sep_ids) * (len(paragraphs) - 1),
             num_chunks=len(chunks),
             avg_chunk_size=sum(c.token_count for c in chunks) / len(chunks) if chunks else 0,
         )
 
         return chunks
 
-    def _split_long_paragraph(self, para: str, full_text: str, start_index: int) -> list[Chunk]:
+    def _split_long_paragraph(self, para: str, para_start: int, start_index: int) -> list[Chunk]:
         """Split a paragraph that exceeds chunk_size into smaller pieces."""
         chunks = []
 
         # Try to split by sentences first
         sentences = self._split_sentences(para)
 
-        current = ""
-        current_start = full_text.find(para)
+        # Offset of each sentence, found by scanning forward from the last one
+        sentence_starts = []
+        cursor = 0
+        for sentence in sentences:
+            cursor = para.find(sentence, cursor)
+            sentence_starts.append(para_start + cursor)
+            cursor += len(sentence)
+
+        # Sentences of the chunk being built, joined once when it is emitted,
+        # and their token ids laid end to end
+        current_parts: list[str] = []
+        current_ids: list[int] = []
+        current_start = para_start
         idx = start_index
 
-        for sentence in sentences:
-            if self.count_tokens(current + " " + sentence if current else sentence) <= self.chunk_size:
-                if current:
-                    current += " " + sentence
+        # The joining space merges into a sentence's first token, so appended
+        # sentences are encoded with it
+        sentence_ids = self._encode_batch(sentences)
+        joined_ids = self._encode_batch([" " + s for s in sentences])
+
+        for sentence, sentence_start, ids, joined in zip(
+            sentences, sentence_starts, sentence_ids, joined_ids
+        ):
+            fit_tokens = len(current_ids) + len(joined) if current_parts else len(ids)
+            if fit_tokens <= self.chunk_size:
+                if current_parts:
+                    current_ids += joined
                 else:
-                    current = sentence
+                    current_start = sentence_start
+                    current_ids = list(ids)
+                current_parts.append(sentence)
             else:
-                if current:
+                if current_parts:
+                    current = " ".join(current_parts)
                     chunks.append(Chunk(
                         content=current,
                         index=idx,
-                        token_count=self.count_tokens(current),
+                        token_count=len(current_ids),
                         start_char=current_start,
                         end_char=current_start + len(current),
+                        token_ids=current_ids,
                     ))
                     idx += 1
-                    current_start += len(current) + 1
 
                 # If single sentence is still too long, force split by tokens
-                if self.count_tokens(sentence) > self.chunk_size:
-                    forced = self._force_split(sentence, current_start, idx)
+                if len(ids) > self.chunk_size:
+                    forced = self._force_split(ids, sentence_start, idx)
                     for fc in forced:
                         chunks.append(fc)
                         idx += 1
-                        current_start += len(fc.content)
-                    current = ""
+                    current_parts = []
+                    current_ids = []
                 else:
-                    current = sentence
+                    current_parts = [sentence]
+                    current_ids = list(ids)
+                    current_start = sentence_start
 
-        if current:
+        if current_parts:
+            current = " ".join(current_parts)
             chunks.append(Chunk(
                 content=current,
                 index=idx,
-                token_count=self.count_tokens(current),
+                token_count=len(current_ids),
                 start_char=current_start,
                 end_char=current_start + len(current),
+                token_ids=current_ids,
             ))
 
         return chunks
 
     def _split_sentences(self, text: str) -> list[str]:
         """Split text into sentences (simple heuristic)."""
-        import re
-        # Split on sentence endings, keeping the punctuation
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return [s for s in (p.strip() for p in _SENTENCE_END.split(text)) if s]
 
-    def _force_split(self, text: str, start_char: int, start_index: int) -> list[Chunk]:
-        """Force split text by token count when sentences are too long."""
+    def _force_split(self, tokens: list[int], start_char: int, start_index: int) -> list[Chunk]:
+        """Force split an encoded text by token count when sentences are too long."""
         chunks = []
-        tokens = self.encoding.encode(text)
         idx = start_index
         char_pos = start_char
 
@@ -211,6 +280,7 @@ class ChunkingService:
                 token_count=len(chunk_tokens),
                 start_char=char_pos,
                 end_char=char_pos + len(chunk_text),
+                token_ids=chunk_tokens,
             ))
             idx += 1
             char_pos += len(chunk_text)
@@ -222,26 +292,28 @@ class ChunkingService:
         if len(chunks) <= 1 or self.chunk_overlap == 0:
             return chunks
 
-        result = [chunks[0]]  # First chunk stays as-is
+        # Overlap is taken from the token ids each chunk already carries, so
+        # only the overlap itself is decoded and nothing is re-encoded
+        space_ids = self.encoding.encode_ordinary(" ")
 
-        for i in range(1, len(chunks)):
-            prev_chunk = chunks[i - 1]
-            curr_chunk = chunks[i]
+        result = [chunks[0]]  # First chunk stays as-is
 
+        for prev_chunk, curr_chunk in zip(chunks, chunks[1:]):
             # Get overlap tokens from end of previous chunk
-            prev_tokens = self.encoding.encode(prev_chunk.content)
-            overlap_tokens = prev_tokens[-self.chunk_overlap:] if len(prev_tokens) > self.chunk_overlap else prev_tokens
+            overlap_tokens = prev_chunk.token_ids[-self.chunk_overlap:]
             overlap_text = self.encoding.decode(overlap_tokens)
 
             # Prepend overlap to current chunk
             new_content = overlap_text + " " + curr_chunk.content
+            token_ids = overlap_tokens + space_ids + curr_chunk.token_ids
 
             result.append(Chunk(
                 content=new_content,
                 index=curr_chunk.index,
-                token_count=self.count_tokens(new_content),
+                token_count=len(token_ids),
                 start_char=curr_chunk.start_char - len(overlap_text) - 1,
                 end_char=curr_chunk.end_char,
+                token_ids=token_ids,
             ))
 
         return result
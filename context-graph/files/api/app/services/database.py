@@ -2,11 +2,17 @@
 
 import json
 import re
-from typing import Optional, Any
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Any
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
+import orjson
 import psycopg
+from psycopg.adapt import Buffer, Loader
 from psycopg.rows import dict_row
+from psycopg.types import TypeInfo
+from psycopg.types.json import set_json_dumps, set_json_loads
 from psycopg_pool import AsyncConnectionPool
 import structlog
 
@@ -14,6 +20,99 @@ from app.config import Settings
 
 log = structlog.get_logger()
 
+# JSON/JSONB parameters and results go through orjson instead of stdlib json
+# (psycopg accepts the bytes orjson.dumps returns as-is)
+set_json_dumps(orjson.dumps)
+set_json_loads(orjson.loads)
+
+# AGE requires loading the extension and setting the search path per session
+AGE_SETUP_SQL = "LOAD 'age'; SET search_path = ag_catalog, public;"
+
+
+class _AgtypeLoader(Loader):
+    """Load AGE agtype values as Python objects while rows are built.
+
+    agtype text is JSON, optionally followed by a type suffix such as
+    ::vertex, ::edge or ::numeric. Values that still don't parse (paths,
+    NaN) come back as the raw string.
+    """
+
+    def load(self, data: Buffer) -> Any:
+        value = bytes(data)
+        head, sep, suffix = value.rpartition(b"::")
+        clean = head if sep and suffix.isalpha() else value
+        try:
+            return orjson.loads(clean)
+        except orjson.JSONDecodeError:
+            pass
+        try:
+            # stdlib json also accepts NaN and Infinity
+            return json.loads(clean)
+        except ValueError:
+            return value.decode()
+
+
+async def _configure_age(conn: psycopg.AsyncConnection) -> None:
+    """Prepare a new pooled connection for Cypher queries.
+
+    Runs once per physical connection; the session keeps the extension,
+    search path and agtype loader for as long as the pool reuses it.
+    """
+    await conn.execute(AGE_SETUP_SQL)
+    info = await TypeInfo.fetch(conn, "agtype")
+    if info is None:
+        raise RuntimeError(
+            "agtype type not found; is the AGE extension installed in this database?"
+        )
+    conn.adapters.register_loader(info.oid, _AgtypeLoader)
+    await conn.commit()
+
+
+# First RETURN clause of a Cypher query, up to ORDER/LIMIT/SKIP or the end
+_RETURN_CLAUSE = re.compile(r'RETURN\s+(.+?)(?:ORDER|LIMIT|SKIP|$)', re.IGNORECASE | re.DOTALL)
+_WORD = re.compile(r'\w+')
+_NON_IDENT = re.compile(r'[^a-zA-Z0-9_]')
+# Graph names are interpolated into SQL, so they must be plain identifiers
+_GRAPH_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def _column_name(item: str) -> str:
+    """Column name for one RETURN item: its alias, or its last dotted segment."""
+    # "expr as alias"
+    parts = item.rsplit(None, 2)
+    if len(parts) == 3 and parts[1].lower() == "as" and _WORD.fullmatch(parts[2]):
+        return parts[2]
+    return _NON_IDENT.sub('_', item.split('.')[-1])
+
+
+@lru_cache(maxsize=512)
+def _return_columns(return_clause: str) -> tuple[tuple[str, ...], str]:
+    """Column names and AGE column definition for a RETURN clause.
+
+    Cached on the clause alone: queries differ in their literal values far
+    more often than in what they return.
+    """
+    # Split on top-level commas only (respect parens, braces, brackets)
+    columns = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(return_clause):
+        if ch in '({[':
+            depth += 1
+        elif ch in ')}]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            columns.append(_column_name(return_clause[start:i].strip()))
+            start = i + 1
+    if start < len(return_clause):
+        columns.append(_column_name(return_clause[start:].strip()))
+
+    return tuple(columns), ", ".join(f"{col} agtype" for col in columns)
+
+
+# Connection of the transaction open in the current task, see Database.transaction()
+_tx_conn: ContextVar[Optional[psycopg.AsyncConnection]] = ContextVar("db_tx_conn", default=None)
+
 
 class Database:
     """PostgreSQL + AGE database service."""
@@ -27,12 +126,18 @@ class Database:
         """Initialize connection pool."""
         self.pool = AsyncConnectionPool(
             conninfo=self._dsn,
-            min_size=2,
-            max_size=10,
+            min_size=self.settings.db_pool_min,
+            max_size=self.settings.db_pool_max,
+            configure=_configure_age,
             open=False,
         )
         await self.pool.open()
-        log.info("Database pool opened", host=self.settings.postgres_host)
+        log.info(
+            "Database pool opened",
+            host=self.settings.postgres_host,
+            min_size=self.settings.db_pool_min,
+            max_size=self.settings.db_pool_max,
+        )
 
     async def disconnect(self):
         """Close connection pool."""
@@ -40,16 +145,40 @@ class Database:
             await self.pool.close()
             log.info("Database pool closed")
 
+    def pool_stats(self) -> dict:
+        """Current pool counters (size, available, waiting, ...) for monitoring."""
+        return self.pool.get_stats() if self.pool else {}
+
     @asynccontextmanager
     async def connection(self):
-        """Get a connection from the pool."""
+        """Get a connection from the pool (or the current transaction's)."""
+        conn = _tx_conn.get()
+        if conn is not None:
+            yield conn
+            return
         async with self.pool.connection() as conn:
             yield conn
 
+    @asynccontextmanager
+    async def transaction(self):
+        """Run every query issued inside the block on one connection.
+
+        Queries made through this service (by the current task, or tasks it
+        spawns) share the transaction, so they commit together — or roll
+        back together if the block raises. Nesting creates a savepoint.
+        """
+        async with self.connection() as conn:
+            async with conn.transaction():
+                token = _tx_conn.set(conn)
+                try:
+                    yield conn
+                finally:
+                    _tx_conn.reset(token)
+
     @asynccontextmanager
     async def cursor(self, row_factory=dict_row):
         """Get a cursor with optional row factory."""
-        async with self.pool.connection() as conn:
+        async with self.connection() as conn:
             async with conn.cursor(row_factory=row_factory) as cur:
                 yield cur
 
@@ -58,6 +187,16 @@ class Database:
         async with self.cursor() as cur:
             await cur.execute(query, params)
 
+    async def execute_many(self, query: str, params_seq: list[tuple]) -> None:
+        """Execute a query once per parameter tuple in a single pipelined batch.
+
+        psycopg prepares the statement server-side for executemany, and the
+        plan stays cached on the pooled connection for later calls with the
+        same query text.
+        """
+        async with self.cursor() as cur:
+            await cur.executemany(query, params_seq)
+
     async def fetch_one(self, query: str, params: tuple = None) -> Optional[dict]:
         """Fetch a single row."""
         async with self.cursor() as cur:
@@ -70,94 +209,95 @@ class Database:
             await cur.execute(query, params)
             return await cur.fetchall()
 
-    async def execute_cypher(self, graph_name: str, cypher: str) -> list[dict]:
-        """Execute a Cypher query on an AGE graph.
+    def _cypher_sql(self, graph_name: str, cypher: str) -> tuple[str, tuple[str, ...]]:
+        """Wrap a Cypher query in AGE's cypher() call.
 
-        Note: AGE requires explicit column definitions in the result.
-        This method auto-detects return columns from the RETURN clause.
-        """
-        # AGE requires loading extension and setting search path
-        setup_sql = "LOAD 'age'; SET search_path = ag_catalog, public;"
+        AGE requires explicit column definitions in the result, so the
+        return columns are auto-detected from the RETURN clause.
 
-        # Parse the RETURN clause to get column names
-        # Simple parser - looks for "RETURN x as a, y as b" pattern
-        return_match = re.search(r'RETURN\s+(.+?)(?:ORDER|LIMIT|SKIP|$)', cypher, re.IGNORECASE | re.DOTALL)
+        cypher() only accepts its query as a literal constant, so both the
+        graph name and the query are interpolated; anything that could
+        break out of them is rejected with ValueError.
+        """
+        if not _GRAPH_NAME.fullmatch(graph_name):
+            raise ValueError(f"Invalid graph name: {graph_name!r}")
+        if "$cypher$" in cypher:
+            raise ValueError("Cypher query must not contain '$cypher$'")
 
+        return_match = _RETURN_CLAUSE.search(cypher)
         if return_match:
-            return_clause = return_match.group(1).strip()
-            # Split on top-level commas only (respect parens, braces, brackets)
-            items: list[str] = []
-            depth = 0
-            current: list[str] = []
-            for ch in return_clause:
-                if ch in ('(', '{', '['):
-                    depth += 1
-                elif ch in (')', '}', ']'):
-                    depth -= 1
-                if ch == ',' and depth == 0:
-                    items.append(''.join(current).strip())
-                    current = []
-                else:
-                    current.append(ch)
-            if current:
-                items.append(''.join(current).strip())
-
-            # Extract column aliases or names
-            columns = []
-            for item in items:
-                # Check for "expr as alias" pattern
-                as_match = re.search(r'\s+as\s+(\w+)\s*$', item, re.IGNORECASE)
-                if as_match:
-                    columns.append(as_match.group(1))
-                else:
-                    # Use the expression itself (cleaned up)
-                    col_name = re.sub(r'[^a-zA-Z0-9_]', '_', item.split('.')[-1])
-                    columns.append(col_name)
-
-            # Build column definition for AGE
-            col_def = ", ".join(f"{col} agtype" for col in columns)
+            columns, col_def = _return_columns(return_match.group(1).strip())
         else:
             col_def = "data agtype"
-            columns = ["data"]
+            columns = ("data",)
 
         cypher_sql = f"""
         SELECT * FROM cypher('{graph_name}', $cypher$
             {cypher}
-        $cypher$) as result({col_def});
+        $cypher$) as result({col_def})
         """
+        return cypher_sql, columns
+
+    async def execute_cypher(self, graph_name: str, cypher: str) -> list[dict]:
+        """Execute a Cypher query on an AGE graph.
+
+        Rows come back as dicts with agtype values already parsed by the
+        connection's loader.
+        """
+        cypher_sql, _ = self._cypher_sql(graph_name, cypher)
 
         async with self.connection() as conn:
             async with conn.cursor(row_factory=dict_row) as cur:
-                await cur.execute(setup_sql)
                 try:
                     await cur.execute(cypher_sql)
                 except Exception as e:
                     log.error("Cypher execution failed", query=cypher[:200], error=str(e))
                     raise
 
-                rows = await cur.fetchall()
-
-                # Parse agtype results
-                results = []
-                for row in rows:
-                    if row:
-                        parsed_row = {}
-                        for col in columns:
-                            if col in row:
-                                parsed_row[col] = self._parse_agtype(row[col])
-                        results.append(parsed_row)
-                return results
-
-    def _parse_agtype(self, value: Any) -> Any:
-        """Parse AGE agtype values to Python types."""
-        if value is None:
-            return None
-        if isinstance(value, str):
-            # AGE returns JSON-like strings, try to parse
+                return await cur.fetchall()
+
+    async def execute_cypher_batch(self, graph_name: str, cyphers: list[str]) -> list[list[dict]]:
+        """Execute several Cypher queries on one connection in pipeline mode.
+
+        The queries are sent back to back and their results read afterwards,
+        so the batch costs about one round trip instead of one per query.
+        Best suited to many small statements; callers with large batches
+        send them in bounded slices. Returns each query's rows, in order. The queries share a transaction:
+        if one fails, the whole batch fails.
+        """
+        if not cyphers:
+            return []
+
+        statements = [self._cypher_sql(graph_name, cypher)[0] for cypher in cyphers]
+
+        async with self.connection() as conn:
+            cursors = [conn.cursor(row_factory=dict_row) for _ in statements]
             try:
-                # Remove ::vertex or ::edge suffixes
-                clean = value.split("::")[0] if "::" in value else value
-                return json.loads(clean)
-            except (json.JSONDecodeError, TypeError):
-                return value
-        return value
+                async with conn.pipeline():
+                    for cur, cypher_sql in zip(cursors, statements):
+                        await cur.execute(cypher_sql)
+                    return [await cur.fetchall() for cur in cursors]
+            except Exception as e:
+                log.error("Cypher batch failed", queries=len(cyphers), query=cyphers[0][:200], error=str(e))
+                raise
+            finally:
+                for cur in cursors:
+                    await cur.close()
+
+    async def stream_cypher(self, graph_name: str, cypher: str) -> AsyncIterator[dict]:
+        """Execute a Cypher query and yield parsed rows as they arrive.
+
+        Uses psycopg's cursor.stream() (libpq single-row mode on a plain
+        cursor, no DECLARE), so rows are never collected into one list. The
+        pooled connection stays checked out until the iteration finishes.
+        """
+        cypher_sql, _ = self._cypher_sql(graph_name, cypher)
+
+        async with self.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                try:
+                    async for row in cur.stream(cypher_sql):
+                        yield row
+                except Exception as e:
+                    log.error("Cypher execution failed", query=cypher[:200], error=str(e))
+                    raise
@@ -1,5 +1,8 @@
 """Embedding service using OpenAI"""
 
+import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import Optional
 
 from openai import AsyncOpenAI
@@ -19,34 +22,104 @@ class EmbeddingService:
         self.model = settings.embedding_model
         self.dimension = settings.embedding_dimensions
 
+        # LRU of recent embeddings keyed by a hash of the text, so repeated
+        # queries and chunks skip the API round trip
+        self._cache: OrderedDict[bytes, list[float]] = OrderedDict()
+        self._cache_size = settings.embedding_cache_size
+
         if settings.openai_api_key:
             self.client = AsyncOpenAI(api_key=settings.openai_api_key)
 
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        if self.client:
+            await self.client.close()
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[list[float]]:
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+        return vector
+
+    def _cache_put(self, key: bytes, vector: list[float]) -> None:
+        if not self._cache_size:
+            return
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     async def embed_text(self, text: str) -> list[float]:
         """Generate embedding for a single text."""
         if not self.client:
             log.warning("OpenAI client not configured, returning zero vector")
             return [0.0] * self.dimension
 
+        key = self._cache_key(text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         response = await self.client.embeddings.create(
             model=self.model,
             input=text,
         )
 
-        return response.data[0].embedding
+        vector = response.data[0].embedding
+        self._cache_put(key, vector)
+        return vector
 
     async def embed_texts(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
+        """Generate embeddings for multiple texts.
+
+        Only texts missing from the cache are requested, in sub-batches of
+        `embedding_batch_size` with up to `embedding_concurrency` requests in
+        flight; results keep input order.
+        """
         if not self.client:
             log.warning("OpenAI client not configured, returning zero vectors")
             return [[0.0] * self.dimension for _ in texts]
 
-        # OpenAI supports batch embedding
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=texts,
-        )
+        keys = [self._cache_key(text) for text in texts]
+        vectors: dict[bytes, list[float]] = {}
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                vectors[key] = cached
+            else:
+                missing[key] = text
+
+        if missing:
+            fresh = await self._embed_batches(list(missing.values()))
+            for key, vector in zip(missing, fresh):
+                self._cache_put(key, vector)
+                vectors[key] = vector
+
+        return [vectors[key] for key in keys]
 
-        # Sort by index to maintain order
-        sorted_embeddings = sorted(response.data, key=lambda x: x.index)
-        return [e.embedding for e in sorted_embeddings]
+    async def _embed_batches(self, texts: list[str]) -> list[list[float]]:
+        """Request embeddings for texts in concurrent sub-batches, in order."""
+        size = self.settings.embedding_batch_size
+        sem = asyncio.Semaphore(self.settings.embedding_concurrency)
+
+        async def embed_batch(batch: list[str]) -> list[list[float]]:
+            async with sem:
+                response = await self.client.embeddings.create(
+                    model=self.model,
+                    input=batch,
+                )
+            # Sort by index to maintain order
+            sorted_embeddings = sorted(response.data, key=lambda x: x.index)
+            return [e.embedding for e in sorted_embeddings]
+
+        batches = await asyncio.gather(
+            *(embed_batch(texts[i:i + size]) for i in range(0, len(texts), size))
+        )
+        return [embedding for batch in batches for embedding in batch]
@@ -5,14 +5,16 @@ Claude's language understanding capabilities. It supports different content
 types with tailored extraction prompts for optimal results.
 """
 
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, get_args
 from dataclasses import dataclass, field
-import json
-import re
+import asyncio
+import hashlib
 from uuid import uuid4
 
+import orjson
 import structlog
-from anthropic import AsyncAnthropic
+from anthropic import APIConnectionError, AsyncAnthropic, InternalServerError, RateLimitError
 
 from app.config import Settings
 from app.models.document import ContentType
@@ -21,12 +23,13 @@ from app.models.entity import EntityType, RelationshipType
 log = structlog.get_logger()
 
 
+
 # ---------------------------------------------------------------------------
 # Data Classes for Extraction Results
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedEntity:
     """An entity extracted from text."""
 
@@ -34,6 +37,8 @@ class ExtractedEntity:
     name: str
     type: EntityType
     properties: dict = field(default_factory=dict)
+    # Lowercased name for deduplication, set once when the entity is parsed
+    _norm_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -45,7 +50,7 @@ class ExtractedEntity:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedRelationship:
     """A relationship extracted from text."""
 
@@ -64,7 +69,7 @@ class ExtractedRelationship:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     """Result of entity extraction from a single chunk."""
 
@@ -82,8 +87,18 @@ class ExtractionResult:
             "model": self.model,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExtractionResult":
+        """Rebuild a result from its to_dict() form."""
+        return cls(
+            entities=[ExtractedEntity(**e) for e in data["entities"]],
+            relationships=[ExtractedRelationship(**r) for r in data["relationships"]],
+            tokens_used=data["tokens_used"],
+            model=data["model"],
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class DocumentExtractionResult:
     """Result of entity extraction from an entire document."""
 
@@ -241,45 +256,68 @@ Extract entities and relationships from the following text.
 }
 
 
-# JSON schema for extraction response
-EXTRACTION_RESPONSE_SCHEMA = """
-## Response Format
-
-You must respond with valid JSON in exactly this format:
-
-```json
-{
-  "entities": [
-    {
-      "temp_id": "e1",
-      "name": "Entity Name",
-      "type": "EntityType",
-      "properties": {
-        "description": "Optional description",
-        "key": "value"
-      }
-    }
-  ],
-  "relationships": [
-    {
-      "source": "e1",
-      "target": "e2",
-      "type": "RELATIONSHIP_TYPE",
-      "properties": {
-        "context": "optional context"
-      }
-    }
-  ]
+# Tool Claude is made to call with its extraction. The arguments arrive as
+# an already-parsed dict, so there is no JSON to fish out of the text reply.
+# One request can carry several chunks, so results come back per chunk_id.
+EXTRACTION_TOOL = {
+    "name": "emit_extraction",
+    "description": (
+        "Record the entities and relationships extracted from each chunk of text, "
+        "one item per chunk with the chunk_id it is numbered with. temp_id must be "
+        "unique within a chunk (e1, e2, e3...) and relationships reference entities "
+        "of the same chunk by temp_id. Only use the entity and relationship types "
+        "specified in the instructions. If a chunk has no entities, pass empty arrays."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "chunks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "chunk_id": {"type": "integer"},
+                        "entities": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "temp_id": {"type": "string"},
+                                    "name": {"type": "string"},
+                                    "type": {"type": "string", "enum": list(get_args(EntityType))},
+                                    "properties": {
+                                        "type": "object",
+                                        "description": "Optional description and other key/value details",
+                                    },
+                                },
+                                "required": ["temp_id", "name", "type"],
+                            },
+                        },
+                        "relationships": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "source": {"type": "string", "description": "temp_id of the source entity"},
+                                    "target": {"type": "string", "description": "temp_id of the target entity"},
+                                    "type": {"type": "string", "enum": list(get_args(RelationshipType))},
+                                    "properties": {
+                                        "type": "object",
+                                        "description": "Optional details such as context",
+                                    },
+                                },
+                                "required": ["source", "target", "type"],
+                            },
+                        },
+                    },
+                    "required": ["chunk_id", "entities", "relationships"],
+                },
+            },
+        },
+        "required": ["chunks"],
+    },
 }
-```
-
-## Important:
-- temp_id must be unique within the response (e1, e2, e3...)
-- Relationships use temp_ids to reference entities
-- Only use the entity and relationship types specified above
-- If no entities found, return empty arrays
-- Return ONLY the JSON, no other text
-"""
+DEFAULT_SYSTEM_PROMPT = EXTRACTION_PROMPTS["general"]
 
 
 # ---------------------------------------------------------------------------
@@ -287,6 +325,49 @@ You must respond with valid JSON in exactly this format:
 # ---------------------------------------------------------------------------
 
 
+# Output token budget per chunk packed into a request
+MAX_TOKENS_PER_CHUNK = 4096
+
+# Errors the client has already retried; a chunk group still failing with one
+# of these is skipped instead of failing the whole document
+TRANSIENT_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+# Message Batches polling: start at BATCH_POLL_INITIAL seconds, double up to BATCH_POLL_MAX
+BATCH_POLL_INITIAL = 5.0
+BATCH_POLL_MAX = 60.0
+
+
+# Known type names mapped to themselves: a lookup both validates a parsed
+# type and swaps it for the one shared string object
+_ENTITY_TYPES: dict[str, str] = {t: t for t in get_args(EntityType)}
+_RELATIONSHIP_TYPES: dict[str, str] = {t: t for t in get_args(RelationshipType)}
+
+
+def _canonical_type(value, types: dict[str, str], default: str) -> str:
+    """Canonical name of a parsed type, or `default` if it is not a known type."""
+    return types.get(value, default) if isinstance(value, str) else default
+
+
+def _is_hashable(value) -> bool:
+    """Whether a property value can go in a set (JSON scalars, not lists or dicts)."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _merge_lists(a: list, b: list) -> list:
+    """Union of two property value lists.
+
+    Flat lists of hashables go through a set; lists holding dicts or lists
+    keep a's order and append b's values not already present.
+    """
+    if all(map(_is_hashable, a)) and all(map(_is_hashable, b)):
+        return list(set(a + b))
+    return a + [v for v in b if v not in a]
+
+
 class ExtractionService:
     """Service for extracting entities and relationships from text using Claude."""
 
@@ -299,12 +380,82 @@ class ExtractionService:
         self.settings = settings
         self.client: Optional[AsyncAnthropic] = None
         self.model = settings.extraction_model
+        # Caps extraction requests in flight across all documents being processed
+        self._sem = asyncio.Semaphore(settings.extraction_concurrency)
+        # Recent chunk results as JSON, so every hit yields fresh objects that
+        # callers may mutate (temp_id prefixing, property merging)
+        self._cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._cache_size = settings.extraction_cache_size
 
         if settings.anthropic_api_key:
-            self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+            # The client retries rate limits, overload and connection errors
+            # with jittered exponential backoff (honoring retry-after)
+            self.client = AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                max_retries=settings.extraction_max_retries,
+            )
         else:
             log.warning("Anthropic API key not configured, extraction will be disabled")
 
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        if self.client:
+            await self.client.close()
+
+    def _cache_key(self, text: str, content_type: ContentType) -> bytes:
+        # Chunk context (filename, chunk index) only steers the prompt, so it
+        # is left out and identical chunks share an entry
+        key = f"{self.model}\0{content_type}\0{text}"
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[ExtractionResult]:
+        data = self._cache.get(key)
+        if data is None:
+            return None
+        self._cache.move_to_end(key)
+        result = ExtractionResult.from_dict(orjson.loads(data))
+        result.tokens_used = 0
+        return result
+
+    def _cache_put(self, key: bytes, result: ExtractionResult) -> None:
+        # Empty results are not kept: they may come from an unparseable response
+        if not self._cache_size or not (result.entities or result.relationships):
+            return
+        self._cache[key] = orjson.dumps(result.to_dict())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _uncached(
+        self,
+        texts: list[str],
+        content_type: ContentType,
+        results: list[ExtractionResult],
+    ) -> list[int]:
+        """Fill `results` from the cache; return the indexes still to extract.
+
+        Empty texts are neither cached nor extracted.
+        """
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            cached = self._cache_get(self._cache_key(text, content_type))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        return pending
+
+    def _cache_results(
+        self,
+        chunks: list[tuple[int, str]],
+        content_type: ContentType,
+        results: list[ExtractionResult],
+    ) -> None:
+        for (_, text), result in zip(chunks, results):
+            self._cache_put(self._cache_key(text, content_type), result)
+
     async def extract_from_chunk(
         self,
         text: str,
@@ -319,55 +470,48 @@ class ExtractionService:
             context: Optional context (e.g., document filename, project info)
 
         Returns:
-            ExtractionResult with entities and relationships
+            ExtractionResult with entities and relationships; a cached result
+            for the same text and content type reports tokens_used=0
         """
         if not self.client:
             log.warning("Extraction skipped: Anthropic client not configured")
             return ExtractionResult(entities=[], relationships=[], tokens_used=0)
 
-        if not text or not text.strip():
-            return ExtractionResult(entities=[], relationships=[], tokens_used=0)
-
-        # Build the prompt
-        system_prompt = EXTRACTION_PROMPTS.get(content_type, EXTRACTION_PROMPTS["general"])
-        system_prompt += "\n\n" + EXTRACTION_RESPONSE_SCHEMA
+        results = [ExtractionResult(entities=[], relationships=[], tokens_used=0)]
+        if self._uncached([text], content_type, results):
+            results = await self._extract_chunks([(0, text)], content_type, context)
+        return results[0]
 
-        # Add context if provided
-        user_message = f"## Text to Extract From:\n\n{text}"
-        if context:
-            context_str = "\n".join(f"- {k}: {v}" for k, v in context.items())
-            user_message = f"## Context:\n{context_str}\n\n{user_message}"
+    async def _extract_chunks(
+        self,
+        chunks: list[tuple[int, str]],
+        content_type: ContentType,
+        context: Optional[dict] = None,
+    ) -> list[ExtractionResult]:
+        """Extract (chunk_id, text) pairs in one request and cache the results.
 
+        Returns one ExtractionResult per chunk, in order. The request's
+        tokens are counted on the first result.
+        """
         try:
             response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ],
-                system=system_prompt,
+                **self._message_params(chunks, content_type, context)
             )
-
-            # Extract the response text
-            response_text = response.content[0].text if response.content else ""
-
-            # Calculate tokens used
-            tokens_used = (response.usage.input_tokens or 0) + (response.usage.output_tokens or 0)
-
-            # Parse the JSON response
-            result = self._parse_extraction_response(response_text)
-            result.tokens_used = tokens_used
-            result.model = self.model
+            results = self._results_from_message(response, [chunk_id for chunk_id, _ in chunks])
+            self._cache_results(chunks, content_type, results)
 
             log.info(
                 "Extraction completed",
                 content_type=content_type,
-                entities_count=len(result.entities),
-                relationships_count=len(result.relationships),
-                tokens_used=tokens_used,
+                chunks=len(chunks),
+                entities_count=sum(len(r.entities) for r in results),
+                relationships_count=sum(len(r.relationships) for r in results),
+                tokens_used=results[0].tokens_used,
+                cache_read_tokens=response.usage.cache_read_input_tokens or 0,
+                cache_write_tokens=response.usage.cache_creation_input_tokens or 0,
             )
 
-            return result
+            return results
 
         except Exception as e:
             log.error(
@@ -377,33 +521,87 @@ class ExtractionService:
             )
             raise
 
-    def _parse_extraction_response(self, response_text: str) -> ExtractionResult:
-        """Parse the JSON response from Claude into ExtractionResult.
+    def _message_params(
+        self,
+        chunks: list[tuple[int, str]],
+        content_type: ContentType,
+        context: Optional[dict] = None,
+    ) -> dict:
+        """Build the Messages API parameters for extracting from (chunk_id, text) pairs."""
+        system_prompt = EXTRACTION_PROMPTS.get(content_type, DEFAULT_SYSTEM_PROMPT)
+
+        # Number each chunk so its results can be matched back
+        chunks_str = "\n\n".join(f"<<<CHUNK {chunk_id}>>>\n{text}" for chunk_id, text in chunks)
+        user_message = f"## Text to Extract From:\n\n{chunks_str}"
+
+        # Add context if provided
+        if context:
+            context_str = "\n".join(f"- {k}: {v}" for k, v in context.items())
+            user_message = f"## Context:\n{context_str}\n\n{user_message}"
+
+        return {
+            "model": self.model,
+            # Output budget grows with the number of chunks in the request,
+            # up to the configured cap
+            "max_tokens": min(MAX_TOKENS_PER_CHUNK * len(chunks), self.settings.extraction_max_tokens),
+            "messages": [
+                {"role": "user", "content": user_message}
+            ],
+            # The tool definition and system prompt are the same for every
+            # chunk of this content type, so the end of the system prompt is
+            # marked as a prompt cache breakpoint (the cached prefix includes
+            # the tools)
+            "system": [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ],
+            "tools": [EXTRACTION_TOOL],
+            "tool_choice": {"type": "tool", "name": EXTRACTION_TOOL["name"]},
+        }
+
+    def _results_from_message(self, message, chunk_ids: list[int]) -> list[ExtractionResult]:
+        """Split a Claude message into one ExtractionResult per chunk_id.
+
+        The message's token usage is counted on the first result.
+        """
+        # tool_choice forces the reply to be a call to the extraction tool
+        tool_input = next(
+            (block.input for block in message.content if block.type == "tool_use"), None
+        )
+        items = tool_input.get("chunks") if isinstance(tool_input, dict) else None
+        if not isinstance(items, list):
+            log.warning("Extraction response has no tool input", tool_input=repr(tool_input)[:200])
+            items = []
+        by_id = {item.get("chunk_id"): item for item in items if isinstance(item, dict)}
+
+        results = []
+        for chunk_id in chunk_ids:
+            data = by_id.get(chunk_id)
+            if data is None:
+                log.warning("Extraction response is missing a chunk", chunk_id=chunk_id)
+                data = {}
+            result = self._parse_extraction_response(data)
+            result.model = self.model
+            results.append(result)
+
+        # Calculate tokens used (input_tokens excludes prompt cache reads and writes)
+        usage = message.usage
+        results[0].tokens_used = (
+            (usage.input_tokens or 0)
+            + (usage.cache_creation_input_tokens or 0)
+            + (usage.cache_read_input_tokens or 0)
+            + (usage.output_tokens or 0)
+        )
+        return results
+
+    def _parse_extraction_response(self, data: dict) -> ExtractionResult:
+        """Parse one chunk's item of the extraction tool input into ExtractionResult.
 
         Args:
-            response_text: Raw text response from Claude
+            data: Entities and relationships Claude reported for the chunk
 
         Returns:
-            ExtractionResult parsed from the response
+            ExtractionResult parsed from the tool input
         """
-        # Try to extract JSON from the response
-        # Handle case where response might have markdown code blocks
-        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-        if json_match:
-            json_str = json_match.group(1).strip()
-        else:
-            # Assume the entire response is JSON
-            json_str = response_text.strip()
-
-        try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            log.warning(
-                "Failed to parse extraction response as JSON",
-                error=str(e),
-                response_preview=response_text[:200],
-            )
-            return ExtractionResult(entities=[], relationships=[])
 
         # Parse entities
         entities = []
@@ -415,10 +613,11 @@ class ExtractionService:
                 entity = ExtractedEntity(
                     temp_id=raw.get("temp_id", f"e{len(entities)+1}"),
                     name=str(raw.get("name", "")).strip(),
-                    type=raw.get("type", "Concept"),
+                    type=_canonical_type(raw.get("type"), _ENTITY_TYPES, "Concept"),
                     properties=raw.get("properties", {}),
                 )
                 if entity.name:  # Only add entities with names
+                    entity._norm_name = entity.name.lower()  # name is already stripped
                     entities.append(entity)
             except Exception as e:
                 log.warning("Failed to parse entity", error=str(e), raw=raw)
@@ -433,7 +632,7 @@ class ExtractionService:
                 rel = ExtractedRelationship(
                     source=str(raw.get("source", "")),
                     target=str(raw.get("target", "")),
-                    type=raw.get("type", "RELATED_TO"),
+                    type=_canonical_type(raw.get("type"), _RELATIONSHIP_TYPES, "RELATED_TO"),
                     properties=raw.get("properties", {}),
                 )
                 if rel.source and rel.target:  # Only add valid relationships
@@ -453,7 +652,11 @@ class ExtractionService:
 
         This method processes all chunks in a document, then deduplicates
         entities with the same name and type, merging their properties
-        and updating relationship references.
+        and updating relationship references. Chunks are sent up to
+        `extraction_chunks_per_request` to a request, through the Message
+        Batches API when `extraction_use_batch_api` is set. A request that
+        still hits transient errors after the client's retries leaves its
+        chunks empty; the document only fails if every request does.
 
         Args:
             chunks: List of text chunks from the document
@@ -468,16 +671,50 @@ class ExtractionService:
         total_tokens = 0
         chunks_processed = 0
 
-        # Process each chunk
-        for i, chunk_text in enumerate(chunks):
-            chunk_context = {**(context or {}), "chunk_index": i, "total_chunks": len(chunks)}
-
-            result = await self.extract_from_chunk(
-                text=chunk_text,
-                content_type=content_type,
-                context=chunk_context,
-            )
+        results = [ExtractionResult(entities=[], relationships=[]) for _ in chunks]
+        if not self.client:
+            log.warning("Extraction skipped: Anthropic client not configured")
+            pending = []
+        else:
+            pending = self._uncached(chunks, content_type, results)
+
+        # Chunks still to extract are packed several to a request, numbered by
+        # their index in the document
+        per_request = self.settings.extraction_chunks_per_request
+        groups = [
+            [(i, chunks[i]) for i in pending[start:start + per_request]]
+            for start in range(0, len(pending), per_request)
+        ]
+        document_context = {**(context or {}), "total_chunks": len(chunks)}
+
+        if groups and self.settings.extraction_use_batch_api:
+            await self._extract_chunks_batch(groups, content_type, document_context, results)
+        elif groups:
+            errors: list[Exception] = []
+
+            async def extract_group(group: list[tuple[int, str]]) -> None:
+                try:
+                    async with self._sem:
+                        group_results = await self._extract_chunks(group, content_type, document_context)
+                except TRANSIENT_ERRORS as e:
+                    errors.append(e)
+                    log.warning(
+                        "Extraction skipped for chunks after retries",
+                        chunk_indexes=[i for i, _ in group],
+                        error=str(e),
+                    )
+                    return
+                for (i, _), result in zip(group, group_results):
+                    results[i] = result
+
+            # Extract all groups concurrently. Other errors (auth, bad
+            # request) are not transient and fail the document right away
+            await asyncio.gather(*(extract_group(group) for group in groups))
+            if len(errors) == len(groups):
+                raise errors[0]
 
+        # Process each chunk
+        for i, result in enumerate(results):
             # Prefix temp_ids with chunk index to make them unique across chunks
             for entity in result.entities:
                 entity.temp_id = f"c{i}_{entity.temp_id}"
@@ -493,14 +730,11 @@ class ExtractionService:
         # Deduplicate entities
         deduped_entities, id_mapping, deduped_count = self._deduplicate_entities(all_entities)
 
-        # Update relationship references to use deduplicated IDs
-        deduped_relationships = self._update_relationship_references(
+        # Point relationships at deduplicated IDs and remove duplicates
+        deduped_relationships = self._remap_and_dedup_relationships(
             all_relationships, id_mapping
         )
 
-        # Remove duplicate relationships
-        deduped_relationships = self._deduplicate_relationships(deduped_relationships)
-
         log.info(
             "Document extraction completed",
             chunks_processed=chunks_processed,
@@ -519,6 +753,70 @@ class ExtractionService:
             deduplicated_count=deduped_count,
         )
 
+    async def _extract_chunks_batch(
+        self,
+        groups: list[list[tuple[int, str]]],
+        content_type: ContentType,
+        context: Optional[dict],
+        results: list[ExtractionResult],
+    ) -> None:
+        """Extract groups of chunks through one Message Batch.
+
+        Submits one request per group of (chunk index, text) pairs, polls
+        with exponential backoff until the batch has ended, then stores each
+        chunk's result in `results` at its index. Groups whose request
+        errored or expired are logged and leave their results empty.
+
+        Args:
+            groups: Chunks to extract, as one list of (index, text) per request
+            content_type: Type of content (spec, component, contract, etc.)
+            context: Optional context (e.g., document filename, project info)
+            results: Per-chunk results of the document, filled in place
+        """
+        requests = [
+            {
+                "custom_id": f"g{g}",
+                "params": self._message_params(group, content_type, context),
+            }
+            for g, group in enumerate(groups)
+        ]
+
+        batch = await self.client.messages.batches.create(requests=requests)
+        log.info("Extraction batch submitted", batch_id=batch.id, requests=len(requests))
+
+        delay = BATCH_POLL_INITIAL
+        while batch.processing_status != "ended":
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+
+        failed = 0
+        async for entry in await self.client.messages.batches.results(batch.id):
+            group = groups[int(entry.custom_id[1:])]
+            if entry.result.type == "succeeded":
+                group_results = self._results_from_message(
+                    entry.result.message, [i for i, _ in group]
+                )
+                self._cache_results(group, content_type, group_results)
+                for (i, _), result in zip(group, group_results):
+                    results[i] = result
+            else:
+                failed += 1
+                log.warning(
+                    "Extraction batch request failed",
+                    batch_id=batch.id,
+                    chunk_indexes=[i for i, _ in group],
+                    result_type=entry.result.type,
+                )
+
+        log.info(
+            "Extraction batch completed",
+            batch_id=batch.id,
+            content_type=content_type,
+            requests=len(requests),
+            failed=failed,
+        )
+
     def _deduplicate_entities(
         self,
         entities: list[ExtractedEntity],
@@ -534,7 +832,7 @@ class ExtractionService:
         # Group entities by (normalized_name, type)
         entity_groups: dict[tuple[str, str], list[ExtractedEntity]] = {}
         for entity in entities:
-            key = (entity.name.lower().strip(), entity.type)
+            key = (entity._norm_name or entity.name.lower().strip(), entity.type)
             if key not in entity_groups:
                 entity_groups[key] = []
             entity_groups[key].append(entity)
@@ -544,26 +842,40 @@ class ExtractionService:
 
         for (name_lower, entity_type), group in entity_groups.items():
             # Use the first entity as the base, but prefer the one with the best name casing
-            base_entity = max(group, key=lambda e: sum(1 for c in e.name if c.isupper()))
+            if len(group) == 1:
+                base_entity = group[0]
+            else:
+                base_entity = max(group, key=lambda e: sum(map(str.isupper, e.name)))
 
             # Generate a new unique ID for the deduplicated entity
             new_id = f"d{len(deduped)+1}"
 
             # Merge properties from all entities in the group
             merged_properties = {}
+            # Hashable members of each property's value list, so repeated
+            # conflicting values are checked in O(1) rather than by list scan
+            seen_values: dict[str, set] = {}
             for entity in group:
                 for key, value in entity.properties.items():
                     if key not in merged_properties:
                         merged_properties[key] = value
                     elif isinstance(merged_properties[key], list) and isinstance(value, list):
                         # Merge lists
-                        merged_properties[key] = list(set(merged_properties[key] + value))
+                        merged_properties[key] = _merge_lists(merged_properties[key], value)
+                        seen_values.pop(key, None)
                     elif merged_properties[key] != value:
                         # Keep both values in a list if they differ
                         existing = merged_properties[key]
                         if not isinstance(existing, list):
                             existing = [existing]
-                        if value not in existing:
+                        seen = seen_values.get(key)
+                        if seen is None:
+                            seen = seen_values[key] = {v for v in existing if _is_hashable(v)}
+                        if _is_hashable(value):
+                            if value not in seen:
+                                seen.add(value)
+                                existing.append(value)
+                        elif value not in existing:
                             existing.append(value)
                         merged_properties[key] = existing
 
@@ -580,21 +892,28 @@ class ExtractionService:
         deduped_count = len(entities) - len(deduped)
         return deduped, id_mapping, deduped_count
 
-    def _update_relationship_references(
+    def _remap_and_dedup_relationships(
         self,
         relationships: list[ExtractedRelationship],
         id_mapping: dict[str, str],
     ) -> list[ExtractedRelationship]:
-        """Update relationship source/target to use deduplicated entity IDs.
+        """Update relationships to deduplicated entity IDs and remove duplicates.
+
+        Relationships are updated in place in a single pass. Self-references
+        created by entity deduplication are dropped, and relationships with
+        the same source, target and type merge their properties into the
+        first one seen.
 
         Args:
             relationships: List of relationships to update
             id_mapping: Mapping from old temp_id to new temp_id
 
         Returns:
-            List of relationships with updated references
+            Deduplicated list of relationships with updated references
         """
-        updated = []
+        # First relationship per key, in first-seen order
+        index: dict[tuple[str, str, str], ExtractedRelationship] = {}
+
         for rel in relationships:
             new_source = id_mapping.get(rel.source, rel.source)
             new_target = id_mapping.get(rel.target, rel.target)
@@ -603,45 +922,18 @@ class ExtractionService:
             if new_source == new_target:
                 continue
 
-            updated.append(ExtractedRelationship(
-                source=new_source,
-                target=new_target,
-                type=rel.type,
-                properties=rel.properties,
-            ))
-
-        return updated
-
-    def _deduplicate_relationships(
-        self,
-        relationships: list[ExtractedRelationship],
-    ) -> list[ExtractedRelationship]:
-        """Remove duplicate relationships (same source, target, type).
-
-        Args:
-            relationships: List of relationships to deduplicate
-
-        Returns:
-            Deduplicated list of relationships
-        """
-        seen: set[tuple[str, str, str]] = set()
-        deduped: list[ExtractedRelationship] = []
-
-        for rel in relationships:
-            key = (rel.source, rel.target, rel.type)
-            if key not in seen:
-                seen.add(key)
-                deduped.append(rel)
+            key = (new_source, new_target, rel.type)
+            existing = index.get(key)
+            if existing is None:
+                rel.source = new_source
+                rel.target = new_target
+                index[key] = rel
             else:
                 # Merge properties from duplicate relationship
-                for existing in deduped:
-                    if (existing.source, existing.target, existing.type) == key:
-                        for k, v in rel.properties.items():
-                            if k not in existing.properties:
-                                existing.properties[k] = v
-                        break
-
-        return deduped
+                for k, v in rel.properties.items():
+                    existing.properties.setdefault(k, v)
+
+        return list(index.values())
 
     async def health_check(self) -> dict:
         """Check if the extraction service is healthy.
@@ -1,16 +1,22 @@
 """Graph operations service using Apache AGE"""
 
 import json
-import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional, get_args
 
 import structlog
 
 from app.services.database import Database
-from app.models.entity import Entity, EntityCreate, Relationship, RelationshipCreate, BatchEntityCreate, BatchRelationshipCreate
+from app.models.entity import Entity, EntityCreate, Relationship, RelationshipCreate, BatchEntityCreate, BatchRelationshipCreate, RelationshipType
 
 log = structlog.get_logger()
-logger = logging.getLogger(__name__)
+
+RELATIONSHIP_TYPES = frozenset(get_args(RelationshipType))
+
+# Relationships re-created per pipelined batch (one statement each) when merging duplicates
+REPOINT_BATCH_SIZE = 100
+
+# Entities fetched per query when exporting a whole graph
+EXPORT_BATCH_SIZE = 500
 
 
 def _validate_id(entity_id: str) -> int:
@@ -105,6 +111,42 @@ class GraphService:
             return results[0]
         return {}
 
+    async def create_subgraph(
+        self,
+        graph_name: str,
+        entities: list[EntityCreate],
+        relationships: list[tuple[int, int, str, dict]],
+    ) -> list:
+        """Create nodes and the relationships between them in one Cypher statement.
+
+        Relationships are (source_index, target_index, type, properties) tuples
+        indexing into `entities`. Returns the new node IDs in entity order.
+        """
+        if not entities:
+            return []
+
+        patterns = [
+            f"(n{i}:{entity.type} {to_cypher_map({'name': entity.name, **entity.properties})})"
+            for i, entity in enumerate(entities)
+        ]
+        for source, target, rel_type, properties in relationships:
+            if rel_type not in RELATIONSHIP_TYPES:
+                raise ValueError(f"Invalid relationship type: {rel_type}")
+            props_cypher = to_cypher_map(properties) if properties else "{}"
+            patterns.append(f"(n{source})-[:{rel_type} {props_cypher}]->(n{target})")
+
+        ids = ", ".join(f"id(n{i})" for i in range(len(entities)))
+        cypher = f"""
+            CREATE {', '.join(patterns)}
+            RETURN [{ids}] as ids
+        """
+
+        results = await self.db.execute_cypher(graph_name, cypher)
+        if results:
+            log.info("Subgraph created", graph=graph_name, entities=len(entities), relationships=len(relationships))
+            return results[0].get("ids") or []
+        return []
+
     async def get_entity(self, graph_name: str, entity_id: str) -> Optional[dict]:
         """Get an entity by ID with its connections."""
         safe_id = _validate_id(entity_id)
@@ -144,6 +186,66 @@ class GraphService:
 
         return await self.db.execute_cypher(graph_name, cypher)
 
+    async def iter_entities(self, graph_name: str, entity_type: Optional[str] = None) -> AsyncIterator[dict]:
+        """Yield every entity in the graph, fetched in batches of EXPORT_BATCH_SIZE.
+
+        Batches are paged by id (keyset), so each query stays bounded however
+        large the graph is and only one batch is held in memory at a time.
+        """
+        type_filter = f":{entity_type}" if entity_type else ""
+
+        last_id = -1
+        while True:
+            rows = await self.db.execute_cypher(graph_name, f"""
+                MATCH (n{type_filter})
+                WHERE id(n) > {last_id}
+                RETURN id(n) as id, n.name as name, labels(n) as type, properties(n) as properties
+                ORDER BY id(n)
+                LIMIT {EXPORT_BATCH_SIZE}
+            """)
+            for row in rows:
+                yield row
+            if len(rows) < EXPORT_BATCH_SIZE:
+                return
+            last_id = _validate_id(rows[-1]["id"])
+
+    async def list_entities_page(
+        self,
+        graph_name: str,
+        entity_type: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> tuple[list[dict], int]:
+        """List a page of entities along with the total number of matches.
+
+        The count is computed in the same Cypher statement and carried on
+        every row, so paging clients get a real total without a second query.
+        """
+        type_filter = f":{entity_type}" if entity_type else ""
+
+        cypher = f"""
+            MATCH (n{type_filter})
+            WITH count(n) as total
+            MATCH (n{type_filter})
+            RETURN id(n) as id, n.name as name, labels(n) as type, properties(n) as properties, total
+            ORDER BY n.name
+            SKIP {offset}
+            LIMIT {limit}
+        """
+
+        rows = await self.db.execute_cypher(graph_name, cypher)
+        if rows:
+            return rows, rows[0].get("total", len(rows))
+        if not offset:
+            return [], 0
+
+        # Past the last page there are no rows to carry the total
+        count = await self.db.execute_cypher(graph_name, f"""
+            MATCH (n{type_filter})
+            RETURN count(n) as total
+        """)
+        return [], count[0].get("total", 0) if count else 0
+
     async def delete_entity(self, graph_name: str, entity_id: str) -> bool:
         """Delete an entity and its relationships."""
         safe_id = _validate_id(entity_id)
@@ -188,6 +290,21 @@ class GraphService:
 
         return await self.db.execute_cypher(graph_name, cypher)
 
+    async def list_relationships_page(self, graph_name: str, limit: int = 100) -> tuple[list[dict], int]:
+        """List relationships along with the total relationship count (one query)."""
+        cypher = f"""
+            MATCH ()-[e]->()
+            WITH count(e) as total
+            MATCH (a)-[r]->(b)
+            RETURN id(r) as id, id(a) as source_id, id(b) as target_id,
+                   type(r) as type, properties(r) as properties,
+                   a.name as source_name, b.name as target_name, total
+            LIMIT {limit}
+        """
+
+        rows = await self.db.execute_cypher(graph_name, cypher)
+        return rows, rows[0].get("total", len(rows)) if rows else 0
+
     async def get_local_graph(
         self,
         graph_name: str,
@@ -234,8 +351,26 @@ class GraphService:
             limit: Maximum nodes to return
             types: Optional list of entity types to filter by
         """
-        nodes = []
+        nodes = [n async for n in self.iter_graph_nodes(graph_name, limit=limit, types=types)]
+        node_ids = [n.get("id") for n in nodes]
+        edges = [e async for e in self.iter_graph_edges(graph_name, node_ids, limit=limit * 2)]
+
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "stats": {
+                "node_count": len(nodes),
+                "edge_count": len(edges),
+            }
+        }
 
+    async def iter_graph_nodes(
+        self,
+        graph_name: str,
+        limit: int = 1000,
+        types: list[str] | None = None
+    ) -> AsyncIterator[dict]:
+        """Stream the nodes of get_full_graph (at most `limit` per query) as they arrive."""
         if types:
             # Fetch nodes for each type separately (AGE requires label in MATCH pattern)
             for entity_type in types:
@@ -245,8 +380,8 @@ class GraphService:
                     ORDER BY n.name
                     LIMIT {limit}
                 """
-                type_nodes = await self.db.execute_cypher(graph_name, type_cypher)
-                nodes.extend(type_nodes)
+                async for row in self.db.stream_cypher(graph_name, type_cypher):
+                    yield row
         else:
             # Get all nodes without type filter
             nodes_cypher = f"""
@@ -254,31 +389,30 @@ class GraphService:
                 RETURN id(n) as id, n.name as name, labels(n) as type, properties(n) as properties
                 LIMIT {limit}
             """
-            nodes = await self.db.execute_cypher(graph_name, nodes_cypher)
-
-        # Get edges between fetched nodes — filter in Cypher via WHERE
-        # clause so only relevant edges are transferred from the database.
-        node_ids = [str(n.get("id")) for n in nodes]
-        if node_ids:
-            id_list = ", ".join(node_ids)
-            edges_cypher = f"""
-                MATCH (a)-[r]->(b)
-                WHERE id(a) IN [{id_list}] AND id(b) IN [{id_list}]
-                RETURN id(r) as id, id(a) as source, id(b) as target, type(r) as type
-                LIMIT {limit * 2}
-            """
-            edges = await self.db.execute_cypher(graph_name, edges_cypher)
-        else:
-            edges = []
+            async for row in self.db.stream_cypher(graph_name, nodes_cypher):
+                yield row
 
-        return {
-            "nodes": nodes,
-            "edges": edges,
-            "stats": {
-                "node_count": len(nodes),
-                "edge_count": len(edges),
-            }
-        }
+    async def iter_graph_edges(
+        self,
+        graph_name: str,
+        node_ids: list,
+        limit: int = 2000
+    ) -> AsyncIterator[dict]:
+        """Stream edges between the given nodes (at most `limit`) as they arrive."""
+        if not node_ids:
+            return
+
+        # Filter in Cypher via WHERE clause so only relevant edges are
+        # transferred from the database.
+        id_list = ", ".join(str(node_id) for node_id in node_ids)
+        edges_cypher = f"""
+            MATCH (a)-[r]->(b)
+            WHERE id(a) IN [{id_list}] AND id(b) IN [{id_list}]
+            RETURN id(r) as id, id(a) as source, id(b) as target, type(r) as type
+            LIMIT {limit}
+        """
+        async for row in self.db.stream_cypher(graph_name, edges_cypher):
+            yield row
 
     # ========================================================================
     # v2 Methods — Update, Batch, Upsert, Find, Relationships, Deduplicate
@@ -442,18 +576,20 @@ class GraphService:
         """
         entities = await self.db.execute_cypher(graph_name, find_cypher)
 
-        # Then get connections for each entity
-        results = []
-        for entity in entities:
-            entity_id = _validate_id(entity.get("id"))
-            conn_cypher = f"""
+        # Then get connections for each entity (unnamed neighbours are
+        # skipped), all queries in one pipelined batch
+        conn_cyphers = [
+            f"""
                 MATCH (n)-[r]-(connected)
-                WHERE id(n) = {entity_id}
+                WHERE id(n) = {_validate_id(entity.get("id"))} AND connected.name IS NOT NULL AND connected.name <> ''
                 RETURN id(connected) as conn_id, connected.name as conn_name,
                        labels(connected) as conn_type, type(r) as rel_type,
                        CASE WHEN startNode(r) = n THEN 'outgoing' ELSE 'incoming' END as direction
             """
-            connections = await self.db.execute_cypher(graph_name, conn_cypher)
+            for entity in entities
+        ]
+        results = []
+        for entity, connections in zip(entities, await self.db.execute_cypher_batch(graph_name, conn_cyphers)):
             results.append({
                 **entity,
                 "connections": [
@@ -548,74 +684,74 @@ class GraphService:
 
     async def merge_duplicates(self, graph_name: str, keep_id: str, remove_ids: list[str]) -> dict:
         """Merge duplicate entities: re-point relationships, delete extras."""
-        safe_keep = _validate_id(keep_id)
-        for remove_id in remove_ids:
-            safe_remove = _validate_id(remove_id)
-
-            # Re-point outgoing relationships (preserving original type)
-            try:
-                # First get the relationships to re-point
-                rels = await self.db.execute_cypher(graph_name, f"""
-                    MATCH (old)-[r]->(target)
-                    WHERE id(old) = {safe_remove} AND id(target) <> {safe_keep}
-                    RETURN id(r) as rid, type(r) as rtype, properties(r) as rprops,
-                           id(target) as tid
-                """)
-                for r in rels:
-                    rtype = r.get("rtype", "RELATED_TO")
-                    rprops = r.get("rprops") or {}
-                    props_cypher = to_cypher_map(rprops) if rprops else "{}"
-                    tid = _validate_id(r["tid"])
-                    await self.db.execute_cypher(graph_name, f"""
-                        MATCH (keeper), (target)
-                        WHERE id(keeper) = {safe_keep} AND id(target) = {tid}
-                        CREATE (keeper)-[nr:{rtype} {props_cypher}]->(target)
-                        RETURN id(nr) as id
-                    """)
-                # Delete old outgoing rels
-                if rels:
-                    await self.db.execute_cypher(graph_name, f"""
-                        MATCH (old)-[r]->(target)
-                        WHERE id(old) = {safe_remove} AND id(target) <> {safe_keep}
-                        DELETE r
-                        RETURN count(*) as deleted
-                    """)
-            except Exception as e:
-                logger.warning("Failed to re-point outgoing relationships for %s: %s", remove_id, e)
+        await self.merge_duplicates_batch(graph_name, [(keep_id, remove_ids)])
+        return {"kept": keep_id, "removed": remove_ids}
 
-            # Re-point incoming relationships (preserving original type)
-            try:
-                rels = await self.db.execute_cypher(graph_name, f"""
-                    MATCH (source)-[r]->(old)
-                    WHERE id(old) = {safe_remove} AND id(source) <> {safe_keep}
-                    RETURN id(r) as rid, type(r) as rtype, properties(r) as rprops,
-                           id(source) as sid
-                """)
-                for r in rels:
-                    rtype = r.get("rtype", "RELATED_TO")
-                    rprops = r.get("rprops") or {}
-                    props_cypher = to_cypher_map(rprops) if rprops else "{}"
-                    sid = _validate_id(r["sid"])
-                    await self.db.execute_cypher(graph_name, f"""
-                        MATCH (source), (keeper)
-                        WHERE id(source) = {sid} AND id(keeper) = {safe_keep}
-                        CREATE (source)-[nr:{rtype} {props_cypher}]->(keeper)
-                        RETURN id(nr) as id
-                    """)
-                if rels:
-                    await self.db.execute_cypher(graph_name, f"""
-                        MATCH (source)-[r]->(old)
-                        WHERE id(old) = {safe_remove} AND id(source) <> {safe_keep}
-                        DELETE r
-                        RETURN count(*) as deleted
-                    """)
-            except Exception as e:
-                logger.warning("Failed to re-point incoming relationships for %s: %s", remove_id, e)
+    async def merge_duplicates_batch(self, graph_name: str, merges: list[tuple[str, list[str]]]) -> int:
+        """Merge many duplicate groups at once.
+
+        Each (keep_id, remove_ids) pair folds the duplicates into keep_id:
+        their relationships (original type and properties) are re-created on
+        the keeper and the duplicates are deleted. Costs one read, one
+        pipelined round trip per REPOINT_BATCH_SIZE relationships (a small
+        MATCH/CREATE statement each) and one delete, however many groups
+        there are. Returns the number of entities removed. If any
+        relationship is not re-created, the error is raised and nothing is
+        deleted.
+        """
+        keeper: dict[int, int] = {}
+        for keep_id, remove_ids in merges:
+            safe_keep = _validate_id(keep_id)
+            for remove_id in remove_ids:
+                keeper[_validate_id(remove_id)] = safe_keep
+        if not keeper:
+            return 0
+
+        id_list = ", ".join(str(i) for i in keeper)
+        rels = await self.db.execute_cypher(graph_name, f"""
+            MATCH (a)-[r]->(b)
+            WHERE id(a) IN [{id_list}] OR id(b) IN [{id_list}]
+            RETURN id(a) as sid, id(b) as tid, type(r) as rtype, properties(r) as rprops
+        """)
+        edges = []
+        for r in rels:
+            sid = _validate_id(r["sid"])
+            tid = _validate_id(r["tid"])
+            source = keeper.get(sid, sid)
+            target = keeper.get(tid, tid)
+            # Edges between a duplicate and its keeper (or two duplicates
+            # of the same group) would become self-loops — drop them
+            if source == target:
+                continue
+            edges.append((source, target, r.get("rtype", "RELATED_TO"), r.get("rprops") or {}))
+
+        # Re-pointing and deleting commit together (a savepoint inside a
+        # caller's transaction): if any edge fails to be re-created the error
+        # propagates and no duplicate is deleted with its relationships
+        async with self.db.transaction():
+            created = 0
+            for i in range(0, len(edges), REPOINT_BATCH_SIZE):
+                results = await self.db.execute_cypher_batch(graph_name, [
+                    self._create_edge_cypher(*edge) for edge in edges[i:i + REPOINT_BATCH_SIZE]
+                ])
+                created += sum(rows[0].get("created", 0) if rows else 0 for rows in results)
+            if created != len(edges):
+                raise RuntimeError(
+                    f"Re-created {created} of {len(edges)} relationships; no duplicates were deleted"
+                )
 
-            # Delete duplicate
-            await self.delete_entity(graph_name, str(safe_remove))
+            # Delete duplicates (DETACH drops their original relationships)
+            await self.batch_delete(graph_name, [str(i) for i in keeper])
+        return len(keeper)
 
-        return {"kept": keep_id, "removed": remove_ids}
+    def _create_edge_cypher(self, source: int, target: int, rtype: str, props: dict) -> str:
+        """Cypher creating one edge between two nodes matched by id."""
+        return f"""
+            MATCH (a), (b)
+            WHERE id(a) = {source} AND id(b) = {target}
+            CREATE (a)-[:{rtype} {to_cypher_map(props)}]->(b)
+            RETURN count(*) as created
+        """
 
     async def get_graph_stats(self, graph_name: str) -> dict:
         """Get statistics about the graph."""
@@ -630,8 +766,7 @@ class GraphService:
             RETURN count(r) as edge_count
         """
 
-        type_counts = await self.db.execute_cypher(graph_name, stats_cypher)
-        edge_result = await self.db.execute_cypher(graph_name, edge_cypher)
+        type_counts, edge_result = await self.db.execute_cypher_batch(graph_name, [stats_cypher, edge_cypher])
 
         node_count = sum(t.get("count", 0) for t in type_counts)
         edge_count = edge_result[0].get("edge_count", 0) if edge_result else 0
@@ -91,9 +91,9 @@ class SearchService:
 
         elapsed_ms = int((time.time() - start_time) * 1000)
 
-        return SearchResponse(
+        return SearchResponse.model_construct(
             results=unique_results,
-            stats=SearchStats(
+            stats=SearchStats.model_construct(
                 vector_hits=vector_hits,
                 graph_hits=graph_hits,
                 total_time_ms=elapsed_ms,
@@ -121,7 +121,7 @@ class SearchService:
             )
 
             return [
-                SearchResult(
+                SearchResult.model_construct(
                     id=f"chunk_{r['id']}",
                     type="chunk",
                     label="Chunk",
@@ -165,7 +165,7 @@ class SearchService:
             results = await self.db.execute_cypher(graph_name, cypher)
 
             return [
-                SearchResult(
+                SearchResult.model_construct(
                     id=str(r.get("id", "")),
                     type="entity",
                     label=normalize_label(r.get("entity_type", "Unknown")),
@@ -1,7 +1,8 @@
 """Vector database service using Qdrant"""
 
+from dataclasses import dataclass
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -19,6 +20,17 @@ from app.config import Settings
 log = structlog.get_logger()
 
 
+@dataclass(slots=True)
+class ChunkRecord:
+    """A stored chunk to index in Qdrant."""
+    id: UUID
+    document_id: UUID
+    content: str
+    content_type: str
+    chunk_index: int
+    metadata: dict
+
+
 class VectorService:
     """Service for Qdrant vector operations."""
 
@@ -70,29 +82,27 @@ class VectorService:
     async def upsert_chunks(
         self,
         project_slug: str,
-        chunks: list[dict],
+        chunks: list[ChunkRecord],
         vectors: list[list[float]],
     ) -> int:
         """Insert or update chunks with their embeddings."""
         collection_name = self._collection_name(project_slug)
 
-        points = []
-        for chunk, vector in zip(chunks, vectors):
-            point_id = str(chunk.get("id", uuid4()))
-            points.append(
-                PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload={
-                        "chunk_id": str(chunk["id"]),
-                        "document_id": str(chunk["document_id"]),
-                        "content": chunk["content"],
-                        "content_type": chunk.get("content_type", "general"),
-                        "chunk_index": chunk.get("chunk_index", 0),
-                        "metadata": chunk.get("metadata", {}),
-                    },
-                )
+        points = [
+            PointStruct(
+                id=str(chunk.id),
+                vector=vector,
+                payload={
+                    "chunk_id": str(chunk.id),
+                    "document_id": str(chunk.document_id),
+                    "content": chunk.content,
+                    "content_type": chunk.content_type,
+                    "chunk_index": chunk.chunk_index,
+                    "metadata": chunk.metadata,
+                },
             )
+            for chunk, vector in zip(chunks, vectors)
+        ]
 
         self.client.upsert(collection_name=collection_name, points=points)
         log.info("Chunks upserted", collection=collection_name, count=len(points))
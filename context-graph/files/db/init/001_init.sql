@@ -26,8 +26,7 @@ CREATE TABLE IF NOT EXISTS projects (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Create index for slug lookups
-CREATE INDEX idx_projects_slug ON projects(slug);
+-- Slug lookups use the index behind the UNIQUE constraint (projects_slug_key)
 
 -- Source documents
 CREATE TABLE IF NOT EXISTS documents (
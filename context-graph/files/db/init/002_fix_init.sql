@@ -16,7 +16,7 @@ CREATE TABLE IF NOT EXISTS public.projects (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_projects_slug ON public.projects(slug);
+-- Slug lookups use the index behind the UNIQUE constraint (projects_slug_key)
 
 -- Documents
 CREATE TABLE IF NOT EXISTS public.documents (
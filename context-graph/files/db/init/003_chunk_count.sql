@@ -0,0 +1,49 @@
+-- Knowledge Graph - Denormalized chunk counts
+-- Keeps documents.chunk_count in sync with public.chunks so document reads
+-- don't have to COUNT(*) the chunks table. Safe to re-run on existing databases.
+
+SET search_path = public;
+
+ALTER TABLE public.documents ADD COLUMN IF NOT EXISTS chunk_count INTEGER NOT NULL DEFAULT 0;
+
+-- Statement-level triggers: a bulk INSERT or a DELETE ... WHERE document_id = ?
+-- updates each parent document once, not once per chunk row
+CREATE OR REPLACE FUNCTION public.chunks_count_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.documents d
+    SET chunk_count = d.chunk_count + n.added
+    FROM (SELECT document_id, COUNT(*) AS added FROM new_chunks GROUP BY document_id) n
+    WHERE d.id = n.document_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.chunks_count_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.documents d
+    SET chunk_count = GREATEST(d.chunk_count - o.removed, 0)
+    FROM (SELECT document_id, COUNT(*) AS removed FROM old_chunks GROUP BY document_id) o
+    WHERE d.id = o.document_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS chunks_count_insert ON public.chunks;
+CREATE TRIGGER chunks_count_insert
+    AFTER INSERT ON public.chunks
+    REFERENCING NEW TABLE AS new_chunks
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.chunks_count_insert();
+
+DROP TRIGGER IF EXISTS chunks_count_delete ON public.chunks;
+CREATE TRIGGER chunks_count_delete
+    AFTER DELETE ON public.chunks
+    REFERENCING OLD TABLE AS old_chunks
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.chunks_count_delete();
+
+-- Backfill documents that existed before the triggers
+UPDATE public.documents d
+SET chunk_count = (SELECT COUNT(*) FROM public.chunks c WHERE c.document_id = d.id);
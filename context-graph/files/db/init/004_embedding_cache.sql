@@ -0,0 +1,12 @@
+-- Knowledge Graph - Embedding cache
+-- Chunk embeddings keyed by a hash of (embedding model, chunk text), so
+-- re-processing a document only sends new or changed chunks to OpenAI.
+-- Safe to re-run on existing databases.
+
+SET search_path = public;
+
+CREATE TABLE IF NOT EXISTS public.embedding_cache (
+    content_hash BYTEA PRIMARY KEY,
+    embedding REAL[] NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
@@ -0,0 +1,11 @@
+-- Knowledge Graph - Project indexes
+-- Backs the keyset (created_at, id) cursor used by GET /api/v1/projects and
+-- drops the duplicate slug index. Safe to re-run on existing databases.
+
+SET search_path = public;
+
+CREATE INDEX IF NOT EXISTS idx_projects_created_at_id ON public.projects(created_at, id);
+
+-- slug is UNIQUE, so its constraint index already serves every
+-- WHERE slug = %s lookup; a second btree only slows down writes
+DROP INDEX IF EXISTS public.idx_projects_slug;
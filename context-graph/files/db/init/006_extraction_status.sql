@@ -0,0 +1,8 @@
+-- Knowledge Graph - Entity extraction status
+-- Tracks entity extraction per document, which runs in the background when
+-- extraction goes through the Message Batches API: 'pending', 'completed' or
+-- 'failed' (details in error_message). Safe to re-run on existing databases.
+
+SET search_path = public;
+
+ALTER TABLE public.documents ADD COLUMN IF NOT EXISTS extraction_status VARCHAR(20);
@@ -0,0 +1,10 @@
+-- Knowledge Graph - Embedding cache pruning
+-- Records when each cached chunk embedding was last used, so entries that no
+-- document has needed for EMBEDDING_CACHE_TTL_DAYS can be deleted.
+-- Safe to re-run on existing databases.
+
+SET search_path = public;
+
+ALTER TABLE public.embedding_cache ADD COLUMN IF NOT EXISTS last_used_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON public.embedding_cache(last_used_at);
@@ -58,29 +58,29 @@ CHARS_PER_TOKEN = 4
 # Output Helpers
 # =============================================================================
 
-def output(data: dict) -> None:
-    print(json.dumps(data))
+# Fixed-shape responses, serialized once — only the reason is encoded per call
+_ALLOW_PREFIX = b'{"hookSpecificOutput":{"hookEventName":"PreToolUse","permissionDecision":"allow","permissionDecisionReason":'
+_DENY_PREFIX = b'{"hookSpecificOutput":{"hookEventName":"PreToolUse","permissionDecision":"deny","permissionDecisionReason":'
+_DECISION_SUFFIX = b"}}\n"
+_EMPTY = b"{}\n"
+
+
+def _write(response: bytes) -> None:
+    sys.stdout.buffer.write(response)
+    sys.stdout.flush()
     sys.exit(0)
 
 
+def output(data: dict) -> None:
+    _write(json.dumps(data).encode() + b"\n" if data else _EMPTY)
+
+
 def allow(reason: str = "") -> None:
-    output({
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": "allow",
-            "permissionDecisionReason": reason or "Auto-approved"
-        }
-    })
+    _write(_ALLOW_PREFIX + json.dumps(reason or "Auto-approved").encode() + _DECISION_SUFFIX)
 
 
 def deny(reason: str) -> None:
-    output({
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": "deny",
-            "permissionDecisionReason": reason
-        }
-    })
+    _write(_DENY_PREFIX + json.dumps(reason).encode() + _DECISION_SUFFIX)
 
 
 # =============================================================================